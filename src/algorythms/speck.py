@@ -3,34 +3,60 @@
 # Plaintext:  6574 694c
 # Ciphertext: a868 42f2
 
+import numpy as np
+
+
+# параметры SPECK32
+WORD_SIZE = 16
+MOD_MASK = (2 ** WORD_SIZE) - 1
+BETA_SHIFT = 2
+ALPHA_SHIFT = 7
+
+# параметры SPECK для различных размеров блока: размер блока -> (размер слова, alpha, beta),
+# 16-битный блок - учебный вариант с 8-битными словами, не входящий в стандарт SPECK
+SPECK_PARAMS = {
+    16: (8, 2, 1),
+    32: (16, 7, 2),
+    48: (24, 8, 3),
+    64: (32, 8, 3),
+    96: (48, 8, 3),
+    128: (64, 8, 3),
+}
+
+# типы numpy для слов различного размера
+WORD_DTYPES = {
+    8: np.uint8,
+    16: np.uint16,
+    24: np.uint32,
+    32: np.uint32,
+    48: np.uint64,
+    64: np.uint64,
+}
+
+
 def enc_SPECK32_wt_key(plaintext, r=1):
     """Преобразование r-раундового алгоритма SPECK над блоком длины 32 бит."""
     if r < 1:
         raise Exception("Количество раундов шифрования не может быть меньше 1")
-    
-    word_size = 16
-    mod_mask = (2 ** word_size) - 1
-    beta_shift = 2
-    alpha_shift = 7
 
     processtext = plaintext
 
     for _ in range(r):
 
-        x = (processtext >> word_size) & mod_mask
-        y = processtext & mod_mask
+        x = (processtext >> WORD_SIZE) & MOD_MASK
+        y = processtext & MOD_MASK
 
-        rs_x = ((x << (word_size - alpha_shift)) + (x >> alpha_shift)) & mod_mask
+        rs_x = ((x << (WORD_SIZE - ALPHA_SHIFT)) + (x >> ALPHA_SHIFT)) & MOD_MASK
 
-        add_sxy = (rs_x + y) & mod_mask
+        add_sxy = (rs_x + y) & MOD_MASK
 
         new_x = add_sxy # ^ k
 
-        ls_y = ((y >> (word_size - beta_shift)) + (y << beta_shift)) & mod_mask
+        ls_y = ((y >> (WORD_SIZE - BETA_SHIFT)) + (y << BETA_SHIFT)) & MOD_MASK
 
         new_y = new_x ^ ls_y
 
-        processtext = (new_x << word_size) + new_y
+        processtext = (new_x << WORD_SIZE) + new_y
 
     return processtext
 
@@ -38,24 +64,88 @@ def enc_SPECK32_wt_key(plaintext, r=1):
 
 def one_round_SPECK_32(plaintext, k=0):
 
-    word_size = 16
-    mod_mask = (2 ** word_size) - 1
-    beta_shift = 2
-    alpha_shift = 7
-
-    x = (plaintext >> word_size) & mod_mask
-    y = plaintext & mod_mask
+    x = (plaintext >> WORD_SIZE) & MOD_MASK
+    y = plaintext & MOD_MASK
 
-    rs_x = ((x << (word_size - alpha_shift)) + (x >> alpha_shift)) & mod_mask
+    rs_x = ((x << (WORD_SIZE - ALPHA_SHIFT)) + (x >> ALPHA_SHIFT)) & MOD_MASK
 
-    add_sxy = (rs_x + y) & mod_mask
+    add_sxy = (rs_x + y) & MOD_MASK
 
     new_x = k ^ add_sxy
 
-    ls_y = ((y >> (word_size - beta_shift)) + (y << beta_shift)) & mod_mask
+    ls_y = ((y >> (WORD_SIZE - BETA_SHIFT)) + (y << BETA_SHIFT)) & MOD_MASK
 
     new_y = new_x ^ ls_y
 
-    ciphertext = (new_x << word_size) + new_y
+    ciphertext = (new_x << WORD_SIZE) + new_y
 
     return ciphertext
+
+
+def get_speck_params(block_size: int):
+    """Возвращает размер слова, сдвиги alpha, beta, тип numpy и маску слова для SPECK с блоком block_size бит"""
+    if block_size not in SPECK_PARAMS:
+        raise Exception("Ошибка: выбран неверный размер блока SPECK")
+    word_size, alpha_shift, beta_shift = SPECK_PARAMS[block_size]
+    dtype = WORD_DTYPES[word_size]
+    return word_size, alpha_shift, beta_shift, dtype, dtype((1 << word_size) - 1)
+
+
+def split_blocks(blocks, block_size: int):
+    """Разбивает массив блоков на массивы старших (x) и младших (y) слов.
+    Блоки размера не более 64 бит задаются массивом uint64, блоки размера 96 и 128 бит - массивом uint64
+    с последней осью длины 2: [..., 0] - старшее слово x, [..., 1] - младшее слово y."""
+    word_size, _, _, dtype, mask = get_speck_params(block_size)
+    blocks = np.asarray(blocks, dtype=np.uint64)
+    if block_size > 64:
+        return blocks[..., 0].astype(dtype) & mask, blocks[..., 1].astype(dtype) & mask
+    return ((blocks >> np.uint64(word_size)) & np.uint64(mask)).astype(dtype), (blocks & np.uint64(mask)).astype(dtype)
+
+
+def join_blocks(x: np.ndarray, y: np.ndarray, block_size: int) -> np.ndarray:
+    """Собирает массив блоков из массивов старших и младших слов (обратно к split_blocks)"""
+    word_size = SPECK_PARAMS[block_size][0]
+    if block_size > 64:
+        return np.stack((x, y), axis=-1).astype(np.uint64)
+    return (x.astype(np.uint64) << np.uint64(word_size)) | y.astype(np.uint64)
+
+
+def SPECK_round_words(x: np.ndarray, y: np.ndarray, block_size: int, k=None):
+    """Один раунд SPECK над массивами слов x, y; k - раундовый ключ (число или массив), None - без ключа"""
+    word_size, alpha_shift, beta_shift, dtype, mask = get_speck_params(block_size)
+
+    rs_x = ((x >> dtype(alpha_shift)) | (x << dtype(word_size - alpha_shift))) & mask
+    new_x = (rs_x + y) & mask
+    if k is not None:
+        new_x = new_x ^ (np.asarray(k, dtype=np.uint64).astype(dtype) & mask)
+
+    ls_y = ((y << dtype(beta_shift)) | (y >> dtype(word_size - beta_shift))) & mask
+    new_y = new_x ^ ls_y
+
+    return new_x, new_y
+
+
+def enc_SPECK_array(blocks, block_size: int = 32, r: int = 1, round_keys=None) -> np.ndarray:
+    """
+    Преобразование r-раундового алгоритма SPECK над массивом блоков.
+    Параметры:
+        blocks:         массив блоков (см. split_blocks)
+        block_size:     размер блока: 16 (учебный вариант), 32, 48, 64, 96 или 128 бит
+        r:              количество раундов
+        round_keys:     раундовые ключи, round_keys[i] - число или массив, согласованный по размеру с blocks,
+                        по умолчанию преобразование без ключа (как enc_SPECK32_wt_key)
+    """
+    if r < 1:
+        raise Exception("Количество раундов шифрования не может быть меньше 1")
+    if round_keys is not None and len(round_keys) < r:
+        raise Exception("Ошибка: количество раундовых ключей меньше количества раундов")
+
+    x, y = split_blocks(blocks, block_size)
+    for i in range(r):
+        x, y = SPECK_round_words(x, y, block_size, None if round_keys is None else round_keys[i])
+    return join_blocks(x, y, block_size)
+
+
+def one_round_SPECK_array(blocks, block_size: int = 32, k=None) -> np.ndarray:
+    """Один раунд SPECK над массивом блоков с раундовым ключом k (как one_round_SPECK_32)"""
+    return enc_SPECK_array(blocks, block_size, 1, None if k is None else [k])
@@ -0,0 +1,174 @@
+"""Битово-срезовое (bit-sliced) моделирование множества генераторов ММЛГ и МАГ с общими параметрами.
+
+Состояния L генераторов с одинаковыми (r, n, pp, mf) и разными начальными заполнениями хранятся по битовым
+плоскостям: planes[c, b, w] - машинное слово, l-ый бит которого равен b-ому биту ячейки c генератора 64 * w + l.
+Тогда сдвиг регистра - перемещение слов, xor точек съема - xor слов, сложение по модулю 2^r - схема
+сложения с последовательным переносом над плоскостями, а циклический сдвиг r-битного значения - перестановка
+плоскостей, и каждая операция выполняется сразу для всех генераторов.
+
+Модифицирующее преобразование для битово-срезового моделирования - функция, отображающая массив плоскостей
+размера (r, words) в массив того же размера (см. bitsliced_SPECK, unsliced_modifier).
+"""
+from typing import Callable, List, Union
+
+import numpy as np
+
+from src.algorythms.speck import SPECK_PARAMS
+from src.generators.cells import check_cell_size, get_cell_mask, join_cells, pack_cells, split_cells, unpack_cells
+from src.generators.mag import MAG
+from src.generators.mmlr import MMLR
+
+
+# количество генераторов в одном машинном слове
+LANES_PER_WORD = 64
+
+
+def to_planes(cells: np.ndarray, r: int) -> np.ndarray:
+    """Переводит массив значений размера (L, ...) + get_cell_shape(r) r-битных чисел в массив плоскостей размера
+    (..., r, words), words = ceil(L / 64)"""
+    cells = np.asarray(cells, dtype='<u8')
+    lanes = cells.shape[0]
+    words = -(-lanes // LANES_PER_WORD)
+    padded = np.zeros((words * LANES_PER_WORD,) + cells.shape[1:], dtype='<u8')
+    padded[:lanes] = cells
+
+    # bits[l, ..., b] - b-ый бит l-го значения
+    bits = unpack_cells(padded, r)
+
+    # плоскости: l-ый бит слова - значение генератора l
+    planes = np.packbits(np.moveaxis(bits, 0, -1), axis=-1, bitorder='little')
+    return np.ascontiguousarray(planes).view('<u8')
+
+
+def from_planes(planes: np.ndarray, lanes: int) -> np.ndarray:
+    """Обратное к to_planes преобразование: возвращает массив значений размера (lanes, ...)"""
+    r = planes.shape[-2]
+    bits = np.unpackbits(np.ascontiguousarray(planes, dtype='<u8').view(np.uint8), axis=-1, bitorder='little')
+    return pack_cells(np.moveaxis(bits[..., :lanes], -1, 0), r)
+
+
+def xor_planes(values: np.ndarray) -> np.ndarray:
+    """xor значений, заданных плоскостями, по первой оси"""
+    return np.bitwise_xor.reduce(values, axis=0)
+
+
+def add_planes(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Сложение по модулю 2^r двух значений, заданных плоскостями размера (r, words), с последовательным переносом"""
+    result = np.empty_like(a)
+    carry = np.zeros_like(a[0])
+    for i in range(a.shape[0]):
+        half_sum = a[i] ^ b[i]
+        result[i] = half_sum ^ carry
+        carry = (a[i] & b[i]) | (carry & half_sum)
+    return result
+
+
+def sum_planes(values: np.ndarray) -> np.ndarray:
+    """Сложение по модулю 2^r значений, заданных плоскостями, по первой оси"""
+    result = values[0]
+    for value in values[1:]:
+        result = add_planes(result, value)
+    return result
+
+
+# функции объединения значений точек съема, заданных плоскостями, для классов генераторов
+BITSLICED_COMBINE_FUNCS = {
+    MMLR: xor_planes,
+    MAG: sum_planes,
+}
+
+
+def bitsliced_SPECK(block_size: int = 32, rounds: int = 1) -> Callable[[np.ndarray], np.ndarray]:
+    """Возвращает битово-срезовое rounds-раундовое преобразование SPECK без ключа (как enc_SPECK_array).
+    Младшие плоскости блока - слово y, старшие - слово x."""
+    word_size, alpha_shift, beta_shift = SPECK_PARAMS[block_size]
+
+    def speck(planes: np.ndarray) -> np.ndarray:
+        if planes.shape[0] != block_size:
+            raise Exception('Ошибка: размер ячейки генератора не равен размеру блока SPECK')
+        x, y = planes[word_size:], planes[:word_size]
+        for _ in range(rounds):
+            # циклические сдвиги - перестановки плоскостей
+            x = add_planes(np.roll(x, -alpha_shift, axis=0), y)
+            y = np.roll(y, beta_shift, axis=0) ^ x
+        return np.concatenate((y, x))
+
+    return speck
+
+
+def unsliced_modifier(mf: Callable[[np.ndarray], np.ndarray]) -> Callable[[np.ndarray], np.ndarray]:
+    """Приводит модифицирующее преобразование, поэлементно применяемое к массиву numpy uint64
+    (enc_SPECK_array, TableModifier, ...), к битово-срезовому виду переводом плоскостей в значения и обратно"""
+
+    def modifier(planes: np.ndarray) -> np.ndarray:
+        r = planes.shape[0]
+        values = from_planes(planes, planes.shape[-1] * LANES_PER_WORD)
+        return to_planes(np.asarray(mf(values), dtype=np.uint64) & get_cell_mask(r), r)
+
+    return modifier
+
+
+class BitslicedGenerator:
+    """
+    Битово-срезовое моделирование набора генераторов ММЛГ или МАГ с одной обратной связью и общими параметрами.
+
+    Атрибуты экземпляров:
+        r: int              размерность ячейки
+        n: int              количество ячеек
+        pp: List[int]       список номеров точек съема
+        mf: function        битово-срезовое модифицирующее преобразование
+        combine: function   объединение значений точек съема (BITSLICED_COMBINE_FUNCS)
+        lanes: int          количество генераторов
+        planes: np.ndarray  плоскости состояний размера (n, r, ceil(lanes / 64))
+    """
+
+    def __init__(
+            self,
+            r: int,
+            n: int,
+            pickup_points: List[int],
+            modifying_func: Callable[[np.ndarray], np.ndarray],
+            init_states: List[int],
+            GEN_class: Union[MAG, MMLR]):
+        check_cell_size(r)
+        if n <= 0:
+            raise Exception('Ошибка: количество ячеек должно быть положительным')
+        if 0 not in pickup_points or set(pickup_points).difference(range(n)):
+            raise Exception('Ошибка: номера точек съема должны лежать в промежутке [0, n-1] и содержать 0')
+        if not init_states:
+            raise Exception('Ошибка: не заданы начальные заполнения')
+        if GEN_class not in BITSLICED_COMBINE_FUNCS:
+            raise Exception('Ошибка: неизвестный класс генератора')
+        self.r = r
+        self.n = n
+        self.pp = pickup_points
+        self.mf = modifying_func
+        self.combine = BITSLICED_COMBINE_FUNCS[GEN_class]
+        self.lanes = len(init_states)
+        self.planes = to_planes(split_cells(init_states, r, n), r)
+
+    def do_cycle(self):
+        """Произвести один цикл работы всех генераторов"""
+        modified_val = self.mf(self.combine(self.planes[self.pp]))
+
+        # сдвиг регистров в сторону младшей ячейки и запись нового значения в старшую ячейку
+        self.planes[:-1] = self.planes[1:]
+        self.planes[-1] = modified_val
+
+    def do_idling(self, idling_rounds: int):
+        """Проделать idling_rounds холостых ходов всех генераторов"""
+        for _ in range(idling_rounds):
+            self.do_cycle()
+
+    def get_current_cells(self) -> np.ndarray:
+        """Возвращает значения ячеек всех генераторов, массив размера (lanes, n)"""
+        return from_planes(self.planes, self.lanes)
+
+    def get_current_output_vals(self) -> np.ndarray:
+        """Возвращает значения ячеек с наименьшим порядковым номером всех генераторов"""
+        return from_planes(self.planes[0], self.lanes)
+
+    def get_current_state_vals(self) -> List[int]:
+        """Возвращает значения состояний всех генераторов (как MMLR.get_current_state_val)"""
+        return join_cells(self.get_current_cells(), self.r)
+
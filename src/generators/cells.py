@@ -0,0 +1,122 @@
+"""Представление значений ячеек генераторов в массивах numpy.
+
+Ячейка размера r <= 64 бит - число uint64. Ячейка размера 64 < r <= 128 бит (r четно) - пара чисел uint64
+по последней оси массива: [..., 0] - старшие r / 2 бит, [..., 1] - младшие r / 2 бит, как блоки SPECK96 и SPECK128
+в enc_SPECK_array, поэтому модифицирующее преобразование SPECK применяется к таким ячейкам без преобразований.
+"""
+from typing import List
+
+import numpy as np
+
+
+# наибольший размер ячейки, значение которой - одно число uint64
+WORD_CELL_BITS = 64
+
+# наибольший размер ячейки, значение которой - пара чисел uint64
+MAX_CELL_BITS = 128
+
+
+def is_wide(r: int) -> bool:
+    """Проверка того, что значение r-битной ячейки задается парой чисел uint64"""
+    return r > WORD_CELL_BITS
+
+
+def check_cell_size(r: int) -> None:
+    """Проверка того, что значения r-битных ячеек представимы в массивах numpy"""
+    if r <= 0 or r > MAX_CELL_BITS:
+        raise Exception(f'Ошибка: размер ячейки генератора должен лежать в промежутке [1, {MAX_CELL_BITS}]')
+    if is_wide(r) and r % 2:
+        raise Exception(f'Ошибка: размер ячейки генератора больше {WORD_CELL_BITS} бит должен быть четным')
+
+
+def get_cell_shape(r: int) -> tuple:
+    """Размерность значения одной ячейки в массиве"""
+    return (2,) if is_wide(r) else ()
+
+
+def get_cell_axis(r: int) -> int:
+    """Номер оси ячеек в массиве значений"""
+    return -2 if is_wide(r) else -1
+
+
+def get_cell_mask(r: int):
+    """Маска из r единиц для значения ячейки"""
+    if is_wide(r):
+        return np.full(2, (1 << (r // 2)) - 1, dtype=np.uint64)
+    return np.uint64((1 << r) - 1)
+
+
+def get_coordinate_index(coordinates: np.ndarray, r: int):
+    """Для координат (номеров бит состояния) возвращает индексы ячеек (кортеж массивов) в массиве значений
+    и маски бит в значениях ячеек, размер масок (len(coordinates), 1)"""
+    cells = coordinates // r
+    offsets = coordinates % r
+    if is_wide(r):
+        half = r // 2
+        index = (cells, np.where(offsets < half, 1, 0))
+        offsets = offsets % half
+    else:
+        index = (cells,)
+    return index, np.left_shift(np.uint64(1), offsets.astype(np.uint64))[:, None]
+
+
+def split_cells(numbers: List[int], r: int, n: int) -> np.ndarray:
+    """Разбивает числа из n * r бит на n ячеек по r бит, возвращает массив размера (len(numbers), n) + get_cell_shape(r)"""
+    if is_wide(r):
+        half = r // 2
+        mask = (1 << half) - 1
+        return np.array(
+            [[((number >> (r * cell + half)) & mask, (number >> (r * cell)) & mask) for cell in range(n)]
+             for number in numbers],
+            dtype=np.uint64).reshape((len(numbers), n, 2))
+
+    mask = (1 << r) - 1
+    return np.array(
+        [[(number >> (r * cell)) & mask for cell in range(n)] for number in numbers],
+        dtype=np.uint64).reshape(len(numbers), n)
+
+
+def join_cells(cells: np.ndarray, r: int) -> List[int]:
+    """Обратное к split_cells преобразование: собирает числа из массива размера (num, n) + get_cell_shape(r)"""
+    if is_wide(r):
+        half = r // 2
+        values = [[(int(high) << half) | int(low) for high, low in row] for row in cells]
+    else:
+        values = [[int(cell) for cell in row] for row in cells]
+    return [sum(value << (r * i) for i, value in enumerate(row)) for row in values]
+
+
+def unpack_cells(cells: np.ndarray, r: int) -> np.ndarray:
+    """Переводит массив значений ячеек размера shape + get_cell_shape(r) в массив бит размера shape + (r,),
+    бит b - b-ый бит значения ячейки"""
+    if is_wide(r):
+        # половины ячейки в порядке от младшей к старшей
+        words = np.ascontiguousarray(np.asarray(cells)[..., ::-1], dtype='<u8')
+        bits = np.unpackbits(words[..., None].view(np.uint8), axis=-1, bitorder='little')[..., :r // 2]
+        return bits.reshape(bits.shape[:-2] + (r,))
+    words = np.ascontiguousarray(cells, dtype='<u8')
+    return np.unpackbits(words[..., None].view(np.uint8), axis=-1, bitorder='little')[..., :r]
+
+
+def pack_cells(bits: np.ndarray, r: int) -> np.ndarray:
+    """Обратное к unpack_cells преобразование: массив бит размера shape + (r,) в массив значений ячеек"""
+    word_bits = r // 2 if is_wide(r) else r
+    words = bits.reshape(bits.shape[:-1] + (-1, word_bits))
+    padded = np.zeros(words.shape[:-1] + (64,), dtype=np.uint8)
+    padded[..., :word_bits] = words
+    packed = np.packbits(padded, axis=-1, bitorder='little').view('<u8')[..., 0].astype(np.uint64)
+    return packed[..., ::-1].copy() if is_wide(r) else packed[..., 0]
+
+
+def add_wide_cells(a: np.ndarray, b: np.ndarray, r: int) -> np.ndarray:
+    """Сложение по модулю 2^r значений ячеек, заданных парами [старшая половина, младшая половина]"""
+    half = r // 2
+    mask = np.uint64((1 << half) - 1)
+    low = a[..., 1] + b[..., 1]
+    if half < 64:
+        carry = low >> np.uint64(half)
+    else:
+        # сложение в uint64 выполняется по модулю 2^64, перенос - признак переполнения
+        carry = (low < a[..., 1]).astype(np.uint64)
+    high = a[..., 0] + b[..., 0] + carry
+    return np.stack((high & mask, low & mask), axis=-1)
@@ -0,0 +1,107 @@
+"""Получение выходной последовательности генераторов ММЛГ и МАГ большими порциями.
+
+Функции работают с любым генератором, имеющим атрибут r и методы do_cycle и get_current_output_val
+(MMLR, MAG, RingMMLR, RingMAG), и на каждом такте читают только выходное значение (младшую ячейку),
+не формируя кортеж (выход, состояние), как при итерировании.
+
+Упакованная выходная последовательность - поток бит, в котором i-ое r-битное выходное значение
+занимает биты [i * r, (i + 1) * r), нумерация бит в каждом байте от младшего к старшему.
+При r, кратном 8, каждое значение записывается r / 8 байтами в порядке от младшего к старшему.
+"""
+from typing import BinaryIO, List, Union
+
+import numpy as np
+
+
+# количество выходных значений, вычисляемых и упаковываемых за один раз (кратно 8, чтобы каждая порция
+# упакованной последовательности занимала целое число байт)
+CHUNK_OUTPUTS = 1 << 16
+
+
+def get_output_dtype(r: int):
+    """Наименьший беззнаковый тип numpy, вмещающий r-битные значения"""
+    for dtype in (np.uint8, np.uint16, np.uint32, np.uint64):
+        if r <= np.iinfo(dtype).bits:
+            return dtype
+    raise Exception('Ошибка: размер ячейки генератора для массива выходных значений не должен превышать 64 бит')
+
+
+def get_packed_size(r: int, count: int) -> int:
+    """Количество байт, занимаемое count упакованными r-битными значениями"""
+    return (count * r + 7) // 8
+
+
+def next_outputs(gen, count: int) -> List[int]:
+    """Производит count тактов работы генератора и возвращает список выходных значений"""
+    do_cycle = gen.do_cycle
+    get_output_val = gen.get_current_output_val
+    outputs = [0] * count
+    for i in range(count):
+        do_cycle()
+        outputs[i] = get_output_val()
+    return outputs
+
+
+def pack_outputs(outputs: List[int], r: int) -> bytes:
+    """Упаковывает r-битные значения в поток бит"""
+    if r in (8, 16, 32, 64):
+        return np.array(outputs, dtype=f'<u{r // 8}').tobytes()
+    if r % 8 == 0:
+        return b''.join(value.to_bytes(r // 8, 'little') for value in outputs)
+    if r < 64:
+        words = np.array(outputs, dtype='<u8')
+        bits = np.unpackbits(words.view(np.uint8).reshape(-1, 8), axis=1, bitorder='little')[:, :r]
+        return np.packbits(bits, bitorder='little').tobytes()
+
+    packed = 0
+    for value in reversed(outputs):
+        packed = (packed << r) | value
+    return packed.to_bytes(get_packed_size(r, len(outputs)), 'little')
+
+
+def generate(gen, count: int) -> np.ndarray:
+    """Возвращает массив из count следующих выходных значений генератора (r <= 64)"""
+    outputs = np.empty(count, dtype=get_output_dtype(gen.r))
+    for start in range(0, count, CHUNK_OUTPUTS):
+        end = min(start + CHUNK_OUTPUTS, count)
+        outputs[start: end] = next_outputs(gen, end - start)
+    return outputs
+
+
+def generate_into(gen, buffer: Union[bytearray, memoryview, np.ndarray], count: int) -> int:
+    """
+    Записывает в буфер count следующих выходных значений генератора в упакованном виде.
+    buffer: изменяемый буфер (bytearray, memoryview, массив numpy) размером не менее get_packed_size(r, count) байт.
+    Возвращает количество записанных байт.
+    """
+    view = memoryview(buffer).cast('B')
+    size = get_packed_size(gen.r, count)
+    if view.nbytes < size:
+        raise Exception('Ошибка: размер буфера недостаточен для записи выходной последовательности')
+
+    offset = 0
+    for start in range(0, count, CHUNK_OUTPUTS):
+        packed = pack_outputs(next_outputs(gen, min(CHUNK_OUTPUTS, count - start)), gen.r)
+        view[offset: offset + len(packed)] = packed
+        offset += len(packed)
+    return size
+
+
+def write_keystream(gen, file: Union[str, BinaryIO], nbytes: int) -> int:
+    """
+    Записывает в файл nbytes байт упакованной выходной последовательности генератора.
+    file: путь к файлу или открытый на запись двоичный файл.
+    Если nbytes * 8 не кратно r, биты последнего выходного значения, не вошедшие в nbytes байт, отбрасываются.
+    Возвращает количество записанных байт.
+    """
+    if isinstance(file, str):
+        with open(file, 'wb') as stream:
+            return write_keystream(gen, stream, nbytes)
+
+    written = 0
+    while written < nbytes:
+        count = min(CHUNK_OUTPUTS, (8 * (nbytes - written) + gen.r - 1) // gen.r)
+        packed = pack_outputs(next_outputs(gen, count), gen.r)[: nbytes - written]
+        file.write(packed)
+        written += len(packed)
+    return written
@@ -1,7 +1,11 @@
 """Реализация класса модифицированного аддитивного генератора и вспомогательных функций"""
 
 import math
-from typing import Callable, List
+from typing import BinaryIO, Callable, List, Union
+
+import numpy as np
+
+from src.generators import keystream
 
 
 def bits_number(num):
@@ -53,6 +57,8 @@ class MAG:
         state: int
     """
 
+    __slots__ = ('r', 'n', 'pp', 'mf', 'state', '_mask', '_pp_shifts', '_last_shift')
+
     def __init__(
             self,
             r: int,
@@ -106,6 +112,11 @@ class MAG:
             raise Exception
         self.state = init_state
 
+        # маска значения ячейки и сдвиги ячеек точек съема и старшей ячейки, вычисляемые один раз
+        self._mask = (1 << r) - 1
+        self._pp_shifts = tuple(r * point for point in pickup_points)
+        self._last_shift = r * (n - 1)
+
     def form_pp_nums(self):
         """Формирует список чисел из ячеек, соответсвующих точкам съема"""
         return form_nums_list(self.state, self.r, self.pp)
@@ -113,26 +124,22 @@ class MAG:
     def do_shift(self, new_val: int):
         """Производит сдвиг регистра и записывает новое значение new_val в последнюю ячейку"""
 
-        # сдвиг в сторону младшей ячейки
-        self.state = self.state >> self.r
-
-        # запись нового значения в старшую ячейку
-        self.state = self.state | (new_val << (self.r * (self.n - 1)))
+        # сдвиг в сторону младшей ячейки и запись нового значения в старшую ячейку
+        self.state = (self.state >> self.r) | (new_val << self._last_shift)
 
     def do_cycle(self):
         """Произвести один цикл работы генератора"""
 
-        # формирование списка зачений из ячеек, соответсвующих точкам съема
-        pp_nums = self.form_pp_nums()
+        state = self.state
+        mask = self._mask
 
-        # сложение по модулю значений точек съема
-        added_nums = nums_add_mod(pp_nums, self.r)
+        # сложение по модулю значений точек съема без формирования промежуточного списка
+        added_nums = 0
+        for shift in self._pp_shifts:
+            added_nums += (state >> shift) & mask
 
-        # применение модифицирующего преобразования
-        modified_val = self.mf(added_nums)
-
-        # сдвиг регистра и запись нового значения
-        self.do_shift(modified_val)
+        # применение модифицирующего преобразования, сдвиг регистра и запись нового значения
+        self.state = (state >> self.r) | (self.mf(added_nums & mask) << self._last_shift)
 
     def get_current_state_val(self) -> int:
         """Возвращает значение, соответсвующее текущему состояния генератора"""
@@ -140,7 +147,7 @@ class MAG:
 
     def get_current_output_val(self) -> int:
         """Возвращает значение ячейки с наименьшим порядковым номером"""
-        return form_nums_list(self.state, self.r, [0])[0]
+        return self.state & self._mask
 
     def get_current_state(self) -> List[int]:
         """Возвращает список значений ячеек, соответсвующий текущему состоянию генератора"""
@@ -151,7 +158,8 @@ class MAG:
 
     def __next__(self):
         self.do_cycle()
-        return self.get_current_output_val(), self.get_current_state_val()
+        state = self.state
+        return state & self._mask, state
 
     def do_idling(self, idling_rounds=0):
         '''
@@ -165,3 +173,15 @@ class MAG:
         for _ in range(n):
             next(self)
             # pass
+
+    def generate(self, count: int) -> np.ndarray:
+        """Возвращает массив из count следующих выходных значений генератора (см. keystream.generate)"""
+        return keystream.generate(self, count)
+
+    def generate_into(self, buffer: Union[bytearray, memoryview, np.ndarray], count: int) -> int:
+        """Записывает в буфер count следующих выходных значений в упакованном виде (см. keystream.generate_into)"""
+        return keystream.generate_into(self, buffer, count)
+
+    def write_keystream(self, file: Union[str, BinaryIO], nbytes: int) -> int:
+        """Записывает в файл nbytes байт упакованной выходной последовательности (см. keystream.write_keystream)"""
+        return keystream.write_keystream(self, file, nbytes)
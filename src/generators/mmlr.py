@@ -1,7 +1,11 @@
 """Реализация класса модифицированного многомерного линейного генератора и вспомогательных функций"""
 
 import math
-from typing import Callable, List
+from typing import BinaryIO, Callable, List, Union
+
+import numpy as np
+
+from src.generators import keystream
 
 
 def bits_number(num):
@@ -53,15 +57,19 @@ class MMLR:
         pp: List[int]
         mf: function
         state: int
+        linear_mf: bool
     """
 
+    __slots__ = ('r', 'n', 'pp', 'mf', 'state', 'linear_mf', '_jump_matrices', '_mask', '_pp_shifts', '_last_shift')
+
     def __init__(
             self,
             r: int,
             n: int,
             pickup_points: List[int],
             modifying_func: Callable,
-            init_state: int = 0):
+            init_state: int = 0,
+            linear_mf: bool = False):
         """
         Конструктор модифицированного многомерного линейного генератора
 
@@ -78,6 +86,10 @@ class MMLR:
                     ...
 
             init_state (int): начальное заполнение регистра
+
+            linear_mf (bool): модифицирующее преобразование линейно над GF(2), тогда такт генератора - линейное
+                отображение, и переход на много тактов вперед (jump, do_idling) выполняется возведением
+                в степень матрицы перехода
         """
         #
         if r <= 0:
@@ -108,6 +120,16 @@ class MMLR:
             raise Exception
         self.state = init_state
 
+        # маска значения ячейки и сдвиги ячеек точек съема и старшей ячейки, вычисляемые один раз
+        self._mask = (1 << r) - 1
+        self._pp_shifts = tuple(r * point for point in pickup_points)
+        self._last_shift = r * (n - 1)
+
+        self.linear_mf = linear_mf
+
+        # матрицы перехода на 2^i тактов, вычисляются при первом обращении к jump
+        self._jump_matrices = []
+
     def form_pp_nums(self):
         """Формирует список чисел из ячеек, соответсвующих точкам съема"""
         return form_nums_list(self.state, self.r, self.pp)
@@ -115,26 +137,89 @@ class MMLR:
     def do_shift(self, new_val: int):
         """Производит сдвиг регистра и записывает новое значение new_val в последнюю ячейку"""
 
-        # сдвиг в сторону младшей ячейки
-        self.state = self.state >> self.r
-
-        # запись нового значения в старшую ячейку
-        self.state = self.state | (new_val << (self.r * (self.n - 1)))
+        # сдвиг в сторону младшей ячейки и запись нового значения в старшую ячейку
+        self.state = (self.state >> self.r) | (new_val << self._last_shift)
 
     def do_cycle(self):
         """Произвести один цикл работы генератора"""
 
-        # формирование списка зачений из ячеек, соответсвующих точкам съема
-        pp_nums = self.form_pp_nums()
+        state = self.state
+        mask = self._mask
 
-        # xor значений точек съема
-        xored_nums = nums_xor(pp_nums)
+        # xor значений точек съема без формирования промежуточного списка
+        xored_nums = 0
+        for shift in self._pp_shifts:
+            xored_nums ^= (state >> shift) & mask
 
-        # применение модифицирующего преобразования
-        modified_val = self.mf(xored_nums)
+        # применение модифицирующего преобразования, сдвиг регистра и запись нового значения
+        self.state = (state >> self.r) | (self.mf(xored_nums) << self._last_shift)
+
+    def get_next_state_val(self, state: int) -> int:
+        """Возвращает значение состояния, в которое генератор переходит из состояния state за один такт"""
+        current_state = self.state
+        self.state = state
+        self.do_cycle()
+        next_state, self.state = self.state, current_state
+        return next_state
 
-        # сдвиг регистра и запись нового значения
-        self.do_shift(modified_val)
+    def state_to_vector(self, state: int) -> np.ndarray:
+        """Возвращает вектор бит состояния (i-ая координата - i-ый бит) над GF(2)"""
+        size = self.n * self.r
+        bits = np.unpackbits(
+            np.frombuffer(state.to_bytes((size + 7) // 8, 'little'), dtype=np.uint8), bitorder='little')
+        return bits[:size].astype(np.float64)
+
+    def vector_to_state(self, vector: np.ndarray) -> int:
+        """Возвращает значение состояния по вектору его бит"""
+        return int.from_bytes(np.packbits(vector.astype(np.uint8), bitorder='little').tobytes(), 'little')
+
+    def get_transition_matrix(self) -> np.ndarray:
+        """
+        Возвращает матрицу T перехода за один такт над GF(2): вектор следующего состояния равен T x (mod 2).
+        Столбец j - следующее состояние для состояния с единственным j-ым единичным битом.
+        Матрица хранится в вещественном виде, так как умножение таких матриц в numpy быстрее целочисленного,
+        а все промежуточные суммы не превосходят n * r и вычисляются точно.
+        """
+        if not self.linear_mf:
+            raise Exception('Ошибка: матрица перехода определена только для линейного модифицирующего преобразования')
+        size = self.n * self.r
+        matrix = np.empty((size, size), dtype=np.float64)
+        for j in range(size):
+            matrix[:, j] = self.state_to_vector(self.get_next_state_val(1 << j))
+
+        # проверка линейности на нулевом, текущем и единичном состояниях
+        if self.get_next_state_val(0) != 0:
+            raise Exception('Ошибка: модифицирующее преобразование не является линейным')
+        for state in (self.state, (1 << size) - 1):
+            if self.get_next_state_val(state) != self.vector_to_state(matrix @ self.state_to_vector(state) % 2):
+                raise Exception('Ошибка: модифицирующее преобразование не является линейным')
+        return matrix
+
+    def jump(self, steps: int):
+        """
+        Переводит генератор на steps тактов вперед.
+        Для линейного модифицирующего преобразования вектор состояния умножается на матрицы перехода T^(2^i)
+        для единичных бит steps, матрицы вычисляются возведением в квадрат и сохраняются для последующих переходов.
+        Иначе производится steps тактов работы генератора.
+        """
+        if steps < 0:
+            raise Exception('Ошибка: количество тактов не может быть отрицательным')
+        if not self.linear_mf:
+            for _ in range(steps):
+                self.do_cycle()
+            return
+
+        if not self._jump_matrices:
+            self._jump_matrices.append(self.get_transition_matrix())
+        while len(self._jump_matrices) < steps.bit_length():
+            square = self._jump_matrices[-1] @ self._jump_matrices[-1]
+            self._jump_matrices.append(np.mod(square, 2, out=square))
+
+        vector = self.state_to_vector(self.state)
+        for i in range(steps.bit_length()):
+            if steps >> i & 1:
+                vector = np.mod(self._jump_matrices[i] @ vector, 2)
+        self.state = self.vector_to_state(vector)
 
     def get_current_state_val(self) -> int:
         """Возвращает значение, соответсвующее текущему состояния генератора"""
@@ -142,7 +227,7 @@ class MMLR:
 
     def get_current_output_val(self) -> int:
         """Возвращает значение ячейки с наименьшим порядковым номером"""
-        return form_nums_list(self.state, self.r, [0])[0]
+        return self.state & self._mask
 
     def get_current_state(self) -> List[int]:
         """Возвращает список значений ячеек, соответсвующий текущему состоянию генератора"""
@@ -153,7 +238,8 @@ class MMLR:
 
     def __next__(self):
         self.do_cycle()
-        return self.get_current_output_val(), self.get_current_state_val()
+        state = self.state
+        return state & self._mask, state
 
     def do_idling(self, idling_rounds=0):
         '''
@@ -164,6 +250,21 @@ class MMLR:
             n = self.n
         else:
             n = idling_rounds
+        if self.linear_mf:
+            self.jump(n)
+            return
         for _ in range(n):
             next(self)
             # pass
+
+    def generate(self, count: int) -> np.ndarray:
+        """Возвращает массив из count следующих выходных значений генератора (см. keystream.generate)"""
+        return keystream.generate(self, count)
+
+    def generate_into(self, buffer: Union[bytearray, memoryview, np.ndarray], count: int) -> int:
+        """Записывает в буфер count следующих выходных значений в упакованном виде (см. keystream.generate_into)"""
+        return keystream.generate_into(self, buffer, count)
+
+    def write_keystream(self, file: Union[str, BinaryIO], nbytes: int) -> int:
+        """Записывает в файл nbytes байт упакованной выходной последовательности (см. keystream.write_keystream)"""
+        return keystream.write_keystream(self, file, nbytes)
@@ -0,0 +1,105 @@
+"""Генераторы ММЛГ и МАГ с хранением состояния в кольцевом буфере.
+
+Значения ячеек хранятся в списке фиксированной длины n, ячейка i (в нумерации генератора) находится в позиции
+(head + i) mod n. Такт работы читает только ячейки точек съема, записывает новое значение на место ячейки 0
+и сдвигает head, то есть выполняется за O(len(pp)) операций над r-битными числами вместо сдвига всего
+n * r-битного состояния. Значение состояния (атрибут state) собирается из ячеек только при обращении к нему,
+поэтому для длинных регистров выходную последовательность следует получать через do_cycle
+и get_current_output_val (как в модуле keystream), а не итерированием, возвращающим состояние на каждом такте.
+"""
+from typing import List
+
+from src.generators.mag import MAG
+from src.generators.mmlr import MMLR
+
+
+class RingBufferRegister:
+    """
+    Общая часть генераторов с кольцевым буфером ячеек, используется вместе с классом MMLR или MAG.
+
+    Атрибуты экземпляров:
+        _cells: List[int]   значения ячеек
+        _head: int          позиция ячейки 0 в _cells
+    """
+
+    __slots__ = ()
+
+    @property
+    def state(self) -> int:
+        """Значение состояния генератора (ячейка 0 - младшие r бит), собирается из ячеек"""
+        cells = self._cells
+        head = self._head
+        state = 0
+        for cell in reversed(cells[head:] + cells[:head]):
+            state = (state << self.r) | cell
+        return state
+
+    @state.setter
+    def state(self, state: int):
+        mask = (1 << self.r) - 1
+        self._cells = [(state >> (self.r * i)) & mask for i in range(self.n)]
+        self._head = 0
+
+    def form_pp_nums(self) -> List[int]:
+        """Формирует список чисел из ячеек, соответсвующих точкам съема"""
+        return [self._cells[(self._head + point) % self.n] for point in self.pp]
+
+    def do_shift(self, new_val: int):
+        """Производит сдвиг регистра и записывает новое значение new_val в последнюю ячейку"""
+
+        # место ячейки 0 занимает новая старшая ячейка
+        self._cells[self._head] = new_val
+        self._head = (self._head + 1) % self.n
+
+    def get_current_output_val(self) -> int:
+        """Возвращает значение ячейки с наименьшим порядковым номером"""
+        return self._cells[self._head]
+
+    def get_current_state(self) -> List[int]:
+        """Возвращает список значений ячеек, соответсвующий текущему состоянию генератора"""
+        return self._cells[self._head:] + self._cells[:self._head]
+
+    def __next__(self):
+        self.do_cycle()
+        return self._cells[self._head], self.state
+
+
+class RingMMLR(RingBufferRegister, MMLR):
+    """Модифицированный многомерный линейный генератор с кольцевым буфером ячеек"""
+
+    __slots__ = ('_cells', '_head')
+
+    def do_cycle(self):
+        """Произвести один цикл работы генератора"""
+        cells = self._cells
+        head = self._head
+        n = self.n
+
+        # xor значений точек съема; позиция head + point - n отрицательна при head + point < n
+        # и по правилам индексации списка указывает на позицию head + point
+        xored_nums = 0
+        for point in self.pp:
+            xored_nums ^= cells[head + point - n]
+
+        cells[head] = self.mf(xored_nums)
+        self._head = head + 1 if head + 1 < n else 0
+
+
+class RingMAG(RingBufferRegister, MAG):
+    """Модифицированный аддитивный генератор с кольцевым буфером ячеек"""
+
+    __slots__ = ('_cells', '_head')
+
+    def do_cycle(self):
+        """Произвести один цикл работы генератора"""
+        cells = self._cells
+        head = self._head
+        n = self.n
+
+        # сложение по модулю значений точек съема (позиции - как в RingMMLR.do_cycle)
+        added_nums = 0
+        for point in self.pp:
+            added_nums += cells[head + point - n]
+
+        cells[head] = self.mf(added_nums & self._mask)
+        self._head = head + 1 if head + 1 < n else 0
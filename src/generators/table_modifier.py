@@ -0,0 +1,104 @@
+"""Табличное задание модифицирующего преобразования генераторов с небольшим размером ячейки.
+
+Модифицирующее преобразование r-битной ячейки при небольших r один раз вычисляется на всех 2^r значениях
+и далее применяется как выборка из таблицы: для числа - обращением к списку, для массива numpy - выборкой
+по индексам. Объект TableModifier вызывается так же, как исходная функция, поэтому передается в MMLR, MAG
+и функции оценки показателя совершенности вместо нее.
+
+Многораундовое преобразование (степень f^k) получается композицией таблиц возведением в степень,
+что позволяет за одну выборку применять k раундов SPECK с 16-битным блоком. Таблица SPECK32
+содержала бы 2^32 значений (16 ГБ), поэтому для нее табличное задание не предусмотрено.
+"""
+from typing import Callable, Union
+
+import numpy as np
+
+from src.algorythms.speck import enc_SPECK_array
+
+
+# наибольший размер ячейки, для которого допускается построение таблицы (2^24 значений uint32 - 64 МБ)
+MAX_TABLE_BITS = 24
+
+
+def get_table_dtype(r: int):
+    """Наименьший беззнаковый тип numpy, вмещающий r-битные значения"""
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if r <= np.iinfo(dtype).bits:
+            return dtype
+    return np.uint64
+
+
+class TableModifier:
+    """
+    Модифицирующее преобразование r-битных чисел, заданное таблицей значений.
+
+    Атрибуты экземпляров:
+        r: int              размер ячейки в битах
+        table: np.ndarray   таблица значений преобразования размера 2^r
+    """
+
+    def __init__(self, table: np.ndarray, r: int):
+        if r > MAX_TABLE_BITS:
+            raise Exception(
+                f'Ошибка: размер таблицы модифицирующего преобразования ограничен 2^{MAX_TABLE_BITS} значениями')
+        if table.shape != (1 << r,):
+            raise Exception('Ошибка: размер таблицы модифицирующего преобразования должен быть равен 2^r')
+        if table.size and int(table.max()) >> r:
+            raise Exception('Ошибка: значения модифицирующего преобразования должны быть r-битными')
+        self.r = r
+        self.table = table.astype(get_table_dtype(r))
+
+        # список питоновских чисел для быстрого применения к одному числу
+        self._values = self.table.tolist()
+
+    @classmethod
+    def from_function(cls, mf: Callable, r: int, vectorized: bool = False) -> 'TableModifier':
+        """
+        Строит таблицу модифицирующего преобразования mf r-битных чисел.
+
+        vectorized: mf поэлементно применяется к массиву numpy (как функции модуля src.algorythms.speck),
+        тогда таблица строится одним вызовом, иначе mf вызывается для каждого из 2^r чисел
+        """
+        if r > MAX_TABLE_BITS:
+            raise Exception(
+                f'Ошибка: размер таблицы модифицирующего преобразования ограничен 2^{MAX_TABLE_BITS} значениями')
+        if vectorized:
+            table = np.asarray(mf(np.arange(1 << r, dtype=np.uint64)), dtype=np.uint64)
+        else:
+            table = np.array([mf(x) for x in range(1 << r)], dtype=np.uint64)
+        return cls(table, r)
+
+    def __call__(self, x: Union[int, np.ndarray]) -> Union[int, np.ndarray]:
+        if isinstance(x, np.ndarray):
+            return self.table[x]
+        return self._values[x]
+
+    def compose(self, other: 'TableModifier') -> 'TableModifier':
+        """Возвращает преобразование x -> other(self(x))"""
+        if other.r != self.r:
+            raise Exception('Ошибка: размеры ячеек композируемых преобразований не совпадают')
+        return TableModifier(other.table[self.table], self.r)
+
+    def __pow__(self, power: int) -> 'TableModifier':
+        """Возвращает power-кратное применение преобразования (power >= 1), вычисляемое возведением в степень"""
+        if power < 1:
+            raise Exception('Ошибка: степень модифицирующего преобразования не должна быть меньше 1')
+        result = None
+        base = self
+        while power:
+            if power & 1:
+                result = base if result is None else result.compose(base)
+            power >>= 1
+            if power:
+                base = base.compose(base)
+        return result
+
+
+def SPECK_table_modifier(block_size: int = 16, rounds: int = 1) -> TableModifier:
+    """Табличное задание rounds-раундового SPECK без ключа для блока block_size бит (не более MAX_TABLE_BITS)"""
+    if block_size > MAX_TABLE_BITS:
+        raise Exception(
+            f'Ошибка: табличное задание SPECK возможно только для блоков не более {MAX_TABLE_BITS} бит')
+    one_round = TableModifier.from_function(
+        lambda x: enc_SPECK_array(x, block_size), block_size, vectorized=True)
+    return one_round ** rounds
@@ -2,6 +2,8 @@ from typing import List
 
 from src.mixing_matrixes.matrixes_generation import (construct_matrix_MMLR,
                                                      construct_matrix_MAG,
+                                                     construct_block_matrix_MMLR,
+                                                     construct_block_matrix_MAG,
                                                      construct_mixing_matrix_pow_SPECK)
 from src.mixing_matrixes.utils import write_matrix_pretty
 from src.mixing_matrixes.mixing_properties import (get_exponent,
@@ -77,7 +79,7 @@ class MixingMatrixesCmdAPI:
             pow:            степень преобразования SPECK.
             max_rounds:     максимальое число раундов, до которого искать экспонент."""
         mt_matrix = construct_mixing_matrix_pow_SPECK(power, r)
-        matrix = construct_matrix_MMLR(r, n, pickup_points, mt_matrix)
+        matrix = construct_block_matrix_MMLR(r, n, pickup_points, mt_matrix)
         exp = get_exponent(matrix, max_rounds)
         print(f'Экспонент = {exp}')
 
@@ -100,7 +102,7 @@ class MixingMatrixesCmdAPI:
             local_start:    позиция начального столбца.
             local_end:      позиция конечного столбца."""
         mt_matrix = construct_mixing_matrix_pow_SPECK(power, r)
-        matrix = construct_matrix_MMLR(r, n, pickup_points, mt_matrix)
+        matrix = construct_block_matrix_MMLR(r, n, pickup_points, mt_matrix)
         exp = get_local_exponent(matrix, max_rounds, local_start, local_end)
         print(f'Локальный экспонент = {exp}')
 
@@ -119,7 +121,7 @@ class MixingMatrixesCmdAPI:
             pow:            степень преобразования SPECK.
             max_rounds:     максимальое число раундов, до которого искать экспонент."""
         mt_matrix = construct_mixing_matrix_pow_SPECK(power, r)
-        matrix = construct_matrix_MAG(r, n, pickup_points, mt_matrix)
+        matrix = construct_block_matrix_MAG(r, n, pickup_points, mt_matrix)
         exp = get_exponent(matrix, max_rounds)
         print(f'Экспонент = {exp}')
 
@@ -142,6 +144,6 @@ class MixingMatrixesCmdAPI:
             local_start:    позиция начального столбца.
             local_end:      позиция конечного столбца."""
         mt_matrix = construct_mixing_matrix_pow_SPECK(power, r)
-        matrix = construct_matrix_MAG(r, n, pickup_points, mt_matrix)
+        matrix = construct_block_matrix_MAG(r, n, pickup_points, mt_matrix)
         exp = get_local_exponent(matrix, max_rounds, local_start, local_end)
         print(f'Локальный экспонент = {exp}')
@@ -0,0 +1,166 @@
+"""Блочное представление перемешивающих матриц генераторов с одной обратной связью.
+
+Перемешивающая матрица ММЛГ (МАГ) из n ячеек размера r состоит из n x n блоков размера r x r:
+блоки (i + 1, i) - единичные матрицы (сдвиг регистра), блоки (p, n - 1) для точек съема p -
+перемешивающая матрица модифицирующего преобразования, остальные блоки нулевые.
+Хранятся только точки съема и блок модифицирующего преобразования, то есть O(r^2) бит вместо O((n*r)^2).
+
+Умножение такой матрицы M на блочный столбец V (n блоков r x c) есть один такт работы регистра над блоками:
+(M V)[i + 1] = V[i], а к блокам (M V)[p] для точек съема p добавляется произведение A V[n - 1].
+При этом M E_b = E_(b+1) для b < n - 1, поэтому блочный столбец b степени M^k совпадает
+с последним блочным столбцом степени M^(k - (n - 1 - b)), и все перемешивающие свойства M^k
+определяются последовательностью M^k E_(n-1), хранение которой требует O(n * r^2) бит.
+"""
+from typing import List, Union
+
+import numpy as np
+
+from src.mixing_matrixes.bool_matrix import BoolMatrix, pack_rows
+
+
+class BlockCompanionMatrix:
+    """
+    Перемешивающая матрица регистра сдвига с одной обратной связью в блочном виде.
+
+    Атрибуты экземпляров:
+        r: int                  размер ячейки (блока)
+        n: int                  количество ячеек
+        pp: List[int]           список номеров точек съема
+        modifier: BoolMatrix    перемешивающая матрица модифицирующего преобразования размера r x r
+    """
+
+    def __init__(self, r: int, n: int, pickup_points: List[int], modifier: Union[np.ndarray, BoolMatrix]):
+        if not isinstance(modifier, BoolMatrix):
+            modifier = BoolMatrix.from_ndarray(modifier)
+        if modifier.shape != (r, r):
+            raise Exception(
+                'Ошибка: размер ячейки генератора не равен размеру матрицы модифицирующего преобразования')
+        if set(pickup_points).difference(range(n)):
+            raise Exception('Ошибка: номера точек съема должны лежать в промежутке [0, n-1]')
+        self.r = r
+        self.n = n
+        self.pp = sorted(set(pickup_points))
+        self.modifier = modifier
+
+    @property
+    def shape(self):
+        size = self.n * self.r
+        return size, size
+
+    def to_ndarray(self) -> np.ndarray:
+        """Возвращает перемешивающую матрицу в плотном виде (как construct_matrix_MMLR)."""
+        r, n = self.r, self.n
+        matrix = np.zeros(self.shape, dtype=int)
+        for i in range(n - 1):
+            matrix[(i + 1) * r: (i + 2) * r, i * r: (i + 1) * r] = np.eye(r, dtype=int)
+        modifier = self.modifier.to_ndarray()
+        for point in self.pp:
+            matrix[point * r: (point + 1) * r, (n - 1) * r: n * r] = modifier
+        return matrix
+
+    def to_bool_matrix(self) -> BoolMatrix:
+        """Возвращает перемешивающую матрицу в виде упакованной булевой матрицы."""
+        return BoolMatrix.from_ndarray(self.to_ndarray())
+
+    def has_zero_row(self) -> bool:
+        """Проверка наличия нулевой строки: строки блоков 1..n-1 содержат единичные блоки,
+        строки нулевого блока совпадают со строками модифицирующей матрицы либо нулевые."""
+        return 0 not in self.pp or self.modifier.has_zero_row()
+
+    def last_column(self) -> np.ndarray:
+        """Возвращает последний блочный столбец E_(n-1) единичной матрицы
+        в виде массива упакованных блоков размера (n, r, words)."""
+        blocks = np.zeros((self.n,) + self.modifier.words.shape, dtype=np.uint64)
+        blocks[self.n - 1] = pack_rows(np.eye(self.r, dtype=bool))
+        return blocks
+
+    def apply(self, blocks: np.ndarray, cols: int = None) -> np.ndarray:
+        """Умножает матрицу на блочный столбец, заданный массивом упакованных блоков размера (n, r, words),
+        и возвращает результат в том же виде. cols - количество столбцов блочного столбца (по умолчанию r)."""
+        if cols is None:
+            cols = self.r
+        result = np.zeros_like(blocks)
+
+        # сдвиг блоков в сторону старших номеров
+        result[1:] = blocks[:-1]
+
+        # добавление произведения модифицирующей матрицы на последний блок в позиции точек съема
+        feedback = (self.modifier @ BoolMatrix(blocks[-1], cols)).words
+        for point in self.pp:
+            result[point] |= feedback
+        return result
+
+    def power_last_columns(self, max_power: int):
+        """Питоновский генератор, последовательно возвращающий блочные столбцы M^k E_(n-1) для k = 1..max_power."""
+        blocks = self.last_column()
+        for _ in range(max_power):
+            blocks = self.apply(blocks)
+            yield blocks
+
+    def __pow__(self, power: int) -> BoolMatrix:
+        """Возведение в степень power >= 1, результат возвращается в виде упакованной булевой матрицы.
+        Блочный столбец b степени M^k равен M^(k-(n-1-b)) E_(n-1) при k >= n - 1 - b и E_(b+k) иначе."""
+        if power < 1:
+            raise Exception('Ошибка: степень матрицы не должна быть меньше 1')
+        r, n = self.r, self.n
+        columns = [self.last_column()] + list(self.power_last_columns(power))
+        dense = np.zeros(self.shape, dtype=bool)
+        for b in range(n):
+            lag = n - 1 - b
+            if power >= lag:
+                column = BoolMatrix(columns[power - lag].reshape(n * r, -1), r).to_bool()
+            else:
+                column = np.zeros((n * r, r), dtype=bool)
+                column[(b + power) * r: (b + power + 1) * r] = np.eye(r, dtype=bool)
+            dense[:, b * r: (b + 1) * r] = column
+        return BoolMatrix(pack_rows(dense), n * r)
+
+    def get_last_cell_mixing_rounds(self, max_rounds: int) -> np.ndarray:
+        """Для каждого столбца j < r последнего блочного столбца возвращает наименьшую степень k <= max_rounds,
+        при которой этот столбец матрицы M^k состоит из единиц, иначе -1."""
+        rounds = np.full(self.r, -1, dtype=np.int64)
+        k = 0
+        for blocks in self.power_last_columns(max(max_rounds, 1)):
+            k += 1
+
+            # столбцы, все элементы которых равны единице
+            full = BoolMatrix(
+                np.bitwise_and.reduce(blocks.reshape(self.n * self.r, -1), axis=0)[None, :],
+                self.r).to_bool()[0]
+            rounds[(rounds == -1) & full] = k
+            if (rounds != -1).all():
+                break
+        return rounds
+
+    def get_columns_mixing_rounds(self, local_start: int, local_end: int, max_rounds: int) -> np.ndarray:
+        """Для каждого столбца из [local_start, local_end) возвращает наименьшую степень k <= max_rounds,
+        при которой этот столбец матрицы M^k состоит из единиц, иначе -1."""
+        columns = np.arange(local_start, local_end)
+        if not columns.size:
+            return columns
+
+        # столбец блока b достигает полноты на n - 1 - b раундов позже соответствующего столбца блока n - 1
+        lags = self.n - 1 - columns // self.r
+        last_rounds = self.get_last_cell_mixing_rounds(max(max_rounds, 1) - int(lags.min()))
+        rounds = last_rounds[columns % self.r] + lags
+        rounds[(last_rounds[columns % self.r] == -1) | (rounds > max(max_rounds, 1))] = -1
+        return rounds
+
+    def get_exponent(self, max_rounds: int) -> int:
+        """Возвращает значение экспоненты матрицы, если число раундов превзошло max_rounds, вернет -1"""
+        return self.get_local_exponent(max_rounds, 0, self.n * self.r)
+
+    def get_local_exponent(self, max_rounds: int, local_start: int, local_end: int) -> int:
+        """Возвращает значение локальной экспоненты матрицы для столбцов [local_start, local_end),
+        если число раундов превзошло max_rounds, вернет -1"""
+
+        # для пустого диапазона столбцов условие перемешивания выполнено уже на первом раунде
+        if local_start >= local_end:
+            return 1
+
+        # при наличии нулевой строки ни один столбец степени матрицы не станет полным,
+        # иначе полнота столбца сохраняется в последующих степенях
+        if self.has_zero_row():
+            return -1
+        rounds = self.get_columns_mixing_rounds(local_start, local_end, max_rounds)
+        return -1 if (rounds == -1).any() else int(rounds.max())
@@ -0,0 +1,168 @@
+"""Булевы матрицы с упаковкой строк в 64-битные слова.
+
+Матрицы рассматриваются над булевым полукольцом ({0, 1}, OR, AND), поэтому
+произведение сразу находится в единично-нормальной форме и не требует
+последующего приведения элементов к 0 и 1.
+"""
+from typing import Tuple
+
+import numpy as np
+
+
+# размер машинного слова, в которое упаковываются строки матрицы
+WORD_SIZE = 64
+
+# количество строк правого множителя, объединяемых в одну таблицу при умножении
+# (метод четырех русских: одна таблица на каждый байт строки левого множителя)
+TABLE_BITS = 8
+
+
+def words_number(cols: int) -> int:
+    """Возвращает количество 64-битных слов, необходимое для хранения строки длины cols."""
+    return (cols + WORD_SIZE - 1) // WORD_SIZE
+
+
+def pack_rows(bits: np.ndarray) -> np.ndarray:
+    """Упаковывает булев массив размера (rows, cols) в массив слов размера (rows, words).
+    j-ый столбец соответствует (j % 64)-ому биту (j // 64)-ого слова строки.
+    """
+    rows, cols = bits.shape
+    padded = np.zeros((rows, words_number(cols) * WORD_SIZE), dtype=np.uint8)
+    padded[:, :cols] = bits
+    packed = np.packbits(padded, axis=1, bitorder='little')
+    return packed.view('<u8').astype(np.uint64)
+
+
+def unpack_rows(words: np.ndarray, cols: int) -> np.ndarray:
+    """Распаковывает массив слов размера (rows, words) в булев массив размера (rows, cols)."""
+    bytes_view = np.ascontiguousarray(words, dtype='<u8').view(np.uint8)
+    bits = np.unpackbits(bytes_view, axis=1, bitorder='little')
+    return bits[:, :cols].astype(bool)
+
+
+def columns_mask(cols: int, start: int = 0, end: int = None) -> np.ndarray:
+    """Возвращает строку-маску (в упакованном виде), в которой установлены столбцы [start, end)."""
+    if end is None:
+        end = cols
+    bits = np.zeros((1, cols), dtype=bool)
+    bits[0, start:end] = True
+    return pack_rows(bits)[0]
+
+
+class BoolMatrix:
+    """
+    Булева матрица, строки которой упакованы в 64-битные слова.
+
+    Атрибуты экземпляров:
+        words: np.ndarray   массив размера (rows, words_number(cols)) типа uint64
+        cols: int           количество столбцов матрицы
+    """
+
+    def __init__(self, words: np.ndarray, cols: int):
+        if words.ndim != 2 or words.shape[1] != words_number(cols):
+            raise Exception('Ошибка: размер массива слов не соответствует числу столбцов матрицы')
+        self.words = words
+        self.cols = cols
+
+    @classmethod
+    def from_ndarray(cls, matrix: np.ndarray) -> 'BoolMatrix':
+        """Строит булеву матрицу из матрицы numpy, все элементы которой большие нуля считаются единицами."""
+        if len(matrix.shape) != 2:
+            raise Exception('Ошибка: matrix не является матрицей')
+        return cls(pack_rows(matrix > 0), matrix.shape[1])
+
+    @classmethod
+    def identity(cls, size: int) -> 'BoolMatrix':
+        """Строит единичную булеву матрицу размера size."""
+        return cls(pack_rows(np.eye(size, dtype=bool)), size)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.words.shape[0], self.cols
+
+    def to_bool(self) -> np.ndarray:
+        """Возвращает матрицу в виде булева массива numpy."""
+        return unpack_rows(self.words, self.cols)
+
+    def to_ndarray(self, dtype=int) -> np.ndarray:
+        """Возвращает матрицу в виде массива numpy из нулей и единиц."""
+        return self.to_bool().astype(dtype)
+
+    def transpose(self) -> 'BoolMatrix':
+        """Возвращает транспонированную матрицу."""
+        return BoolMatrix(pack_rows(self.to_bool().T), self.shape[0])
+
+    def copy(self) -> 'BoolMatrix':
+        return BoolMatrix(self.words.copy(), self.cols)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, BoolMatrix):
+            return NotImplemented
+        return self.cols == other.cols and np.array_equal(self.words, other.words)
+
+    def __or__(self, other: 'BoolMatrix') -> 'BoolMatrix':
+        if self.shape != other.shape:
+            raise Exception('Ошибка: размеры матриц не совпадают')
+        return BoolMatrix(self.words | other.words, self.cols)
+
+    def __matmul__(self, other: 'BoolMatrix') -> 'BoolMatrix':
+        """Произведение матриц над булевым полукольцом: строка i результата есть OR тех строк other,
+        номера которых соответствуют единицам i-ой строки self.
+
+        Строки other группируются по TABLE_BITS штук, для каждой группы строится таблица всех
+        OR-комбинаций строк группы, после чего строки результата набираются выборкой из таблиц
+        по байтам строк self (метод четырех русских).
+        """
+        rows, inner = self.shape
+        if inner != other.shape[0]:
+            raise Exception('Ошибка: размеры перемножаемых матриц не согласованы')
+
+        # байты строк левого множителя: k-ый байт задает строки other с номерами [8k, 8k + 8)
+        self_bytes = np.ascontiguousarray(self.words, dtype='<u8').view(np.uint8)
+
+        result = np.zeros((rows, other.words.shape[1]), dtype=np.uint64)
+        table = np.zeros((1 << TABLE_BITS, other.words.shape[1]), dtype=np.uint64)
+
+        for group in range(0, inner, TABLE_BITS):
+            group_rows = other.words[group: group + TABLE_BITS]
+
+            # table[x] - OR строк группы, номера которых соответствуют единичным битам x
+            for bit in range(group_rows.shape[0]):
+                size = 1 << bit
+                np.bitwise_or(table[:size], group_rows[bit], out=table[size: 2 * size])
+
+            result |= table[self_bytes[:, group // TABLE_BITS]]
+
+        return BoolMatrix(result, other.cols)
+
+    def __pow__(self, power: int) -> 'BoolMatrix':
+        """Возведение квадратной матрицы в степень power >= 1 над булевым полукольцом."""
+        if power < 1:
+            raise Exception('Ошибка: степень матрицы не должна быть меньше 1')
+        result = None
+        base = self
+        while power:
+            if power & 1:
+                result = base if result is None else result @ base
+            power >>= 1
+            if power:
+                base = base @ base
+        return result
+
+    def is_full(self) -> bool:
+        """Проверка того, что все элементы матрицы равны единице."""
+        return bool((self.words == columns_mask(self.cols)).all())
+
+    def is_local_full(self, local_start: int, local_end: int) -> bool:
+        """Проверка того, что все элементы столбцов [local_start, local_end) равны единице."""
+        mask = columns_mask(self.cols, local_start, local_end)
+        return bool(((self.words & mask) == mask).all())
+
+    def has_zero_row(self) -> bool:
+        """Проверка того, что в матрице есть строка, состоящая из нулей."""
+        return bool((self.words == 0).all(axis=1).any())
+
+    def has_zero_column(self) -> bool:
+        """Проверка того, что в матрице есть столбец, состоящий из нулей."""
+        columns = np.bitwise_or.reduce(self.words, axis=0)
+        return not np.array_equal(columns, columns_mask(self.cols))
@@ -0,0 +1,150 @@
+"""Вычисление экспонентов перемешивающих матриц по структуре соответствующего орграфа.
+
+Перемешивающая матрица M рассматривается как матрица смежности орграфа, в котором M[i, j] = 1 означает дугу i -> j.
+Столбец j матрицы M^k состоит из единиц тогда и только тогда, когда в вершину j ведут пути длины k из всех вершин,
+поэтому вместо возведения M в степень для каждого столбца j строится последовательность множеств P_k(j)
+начал путей длины k, оканчивающихся в j (обход в ширину по битовым множествам в обратном направлении).
+Функции get_exponent и get_local_exponent возвращают те же значения, что и одноименные функции модуля mixing_properties.
+"""
+from math import gcd
+from typing import Iterable, List, Union
+
+import numpy as np
+
+from src.mixing_matrixes.bool_matrix import BoolMatrix, columns_mask, unpack_rows
+from src.mixing_matrixes.mixing_properties import to_bool_matrix
+
+
+def get_distances(matrix: BoolMatrix, vertex: int) -> np.ndarray:
+    """Возвращает длины кратчайших путей из вершины vertex во все вершины орграфа, -1 для недостижимых вершин."""
+    size = matrix.shape[0]
+    distances = np.full(size, -1, dtype=np.int64)
+    distances[vertex] = 0
+
+    frontier = np.array([vertex])
+    level = 0
+    while frontier.size:
+        level += 1
+
+        # множество вершин, в которые ведут дуги из текущего фронта
+        successors = np.bitwise_or.reduce(matrix.words[frontier], axis=0)
+        reached = unpack_rows(successors[None, :], size)[0]
+
+        frontier = np.flatnonzero(reached & (distances == -1))
+        distances[frontier] = level
+    return distances
+
+
+def is_strongly_connected(matrix: BoolMatrix) -> bool:
+    """Проверка сильной связности орграфа: все вершины достижимы из нулевой и нулевая достижима из всех."""
+    return bool((get_distances(matrix, 0) != -1).all() and (get_distances(matrix.transpose(), 0) != -1).all())
+
+
+def get_period(matrix: BoolMatrix) -> int:
+    """Возвращает период (индекс импримитивности) сильно связного орграфа - НОД длин его циклов.
+    Для орграфа, не являющегося сильно связным, возвращает 0.
+    """
+    if not is_strongly_connected(matrix):
+        return 0
+
+    # для каждой дуги u -> v величина d(u) + 1 - d(v) кратна периоду, и НОД этих величин равен периоду
+    distances = get_distances(matrix, 0)
+    tails, heads = np.nonzero(matrix.to_bool())
+    period = 0
+    for diff in np.unique(np.abs(distances[tails] + 1 - distances[heads])):
+        period = gcd(period, int(diff))
+    return period
+
+
+def is_primitive(matrix: BoolMatrix) -> bool:
+    """Проверка примитивности матрицы: орграф сильно связен и НОД длин его циклов равен 1.
+    Только для примитивной матрицы существует степень, все элементы которой положительны.
+    """
+    return get_period(matrix) == 1
+
+
+def get_columns_mixing_rounds(matrix: BoolMatrix, columns: Iterable[int], max_rounds: int) -> List[int]:
+    """Для каждого столбца j из columns возвращает наименьшую степень k <= max_rounds,
+    при которой столбец j матрицы matrix^k состоит из единиц, иначе -1.
+    """
+    size = matrix.shape[0]
+
+    # i-ая строка - множество P_1(i) вершин, из которых есть дуга в i
+    predecessors = matrix.transpose()
+    predecessors_bits = predecessors.to_bool()
+    single_predecessor = np.where(
+        predecessors_bits.sum(axis=1) == 1,
+        predecessors_bits.argmax(axis=1),
+        -1)
+
+    # если в вершину j ведет единственная дуга i -> j, то P_k(j) = P_(k-1)(i),
+    # поэтому столбцы сводятся к корневым с увеличением номера раунда на длину цепочки
+    chains = []
+    roots = set()
+    for column in columns:
+        current, depth, visited = column, 0, set()
+        while size > 1 and single_predecessor[current] != -1 and current not in visited:
+            visited.add(current)
+            current = int(single_predecessor[current])
+            depth += 1
+        if current in visited:
+            # цепочка замкнулась, множества P_k(j) всегда одноэлементны
+            chains.append((None, depth))
+        else:
+            chains.append((current, depth))
+            roots.add(current)
+
+    # обход в ширину одновременно для всех корневых столбцов,
+    # столбец исключается из обхода, как только множество P_k стало полным
+    root_rounds = {}
+    active = np.array(sorted(roots), dtype=np.int64)
+    frontier = BoolMatrix(predecessors.words[active], size)
+    full_row = columns_mask(size)
+    k = 1
+    while active.size:
+        done = (frontier.words == full_row).all(axis=1)
+        for root in active[done]:
+            root_rounds[int(root)] = k
+        active = active[~done]
+        if not active.size or k >= max_rounds:
+            break
+        frontier = BoolMatrix(frontier.words[~done], size) @ predecessors
+        k += 1
+
+    rounds = []
+    for root, depth in chains:
+        if root is None or root not in root_rounds or root_rounds[root] + depth > max(max_rounds, 1):
+            rounds.append(-1)
+        else:
+            rounds.append(root_rounds[root] + depth)
+    return rounds
+
+
+def get_exponent(mix_matr: Union[np.ndarray, BoolMatrix], max_rounds: int) -> int:
+    """Возвращает значение экспоненты для перемешивающей матрицы mix_matr,
+    если число раундов превзошло max_rounds, вернет -1"""
+    matrix = to_bool_matrix(mix_matr)
+
+    # для непримитивной матрицы экспонент не существует
+    if not is_primitive(matrix):
+        return -1
+
+    rounds = get_columns_mixing_rounds(matrix, range(matrix.shape[0]), max_rounds)
+    return -1 if -1 in rounds else max(rounds)
+
+
+def get_local_exponent(mix_matr: Union[np.ndarray, BoolMatrix], max_rounds: int, local_start: int, local_end: int) -> int:
+    """Возвращает значение экспоненты для перемешивающей матрицы mix_matr,
+    если число раундов превзошло max_rounds, вернет -1"""
+    # для пустого диапазона столбцов условие перемешивания выполнено уже на первом раунде
+    if local_start >= local_end:
+        return 1
+
+    matrix = to_bool_matrix(mix_matr)
+
+    # при наличии вершины без исходящих дуг ни один столбец степени матрицы не станет полным
+    if matrix.has_zero_row():
+        return -1
+
+    rounds = get_columns_mixing_rounds(matrix, range(local_start, local_end), max_rounds)
+    return -1 if -1 in rounds else max(rounds)
@@ -0,0 +1,124 @@
+"""Кэш степеней перемешивающих матриц модифицирующих преобразований.
+
+Степень перемешивающей матрицы преобразования зависит только от самого преобразования, размера блока и степени,
+поэтому вычисленные степени хранятся в LRU-кэше процесса и, при заданном каталоге, на диске.
+Ключ записи содержит хэш однораундовой матрицы, так что при изменении построения матрицы старые записи
+на диске не используются. Модуль используется и скриптами из каталога МЛГ (МЛГ/mixing_matrixes.py),
+так что записи в общем каталоге кэша доступны обоим.
+Отсутствующая степень вычисляется домножением наибольшей из имеющихся меньших степеней на однораундовую матрицу,
+при этом сохраняются и все промежуточные степени.
+"""
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Callable, Tuple
+
+import numpy as np
+
+from src.mixing_matrixes.bool_matrix import BoolMatrix
+
+
+# максимальное количество матриц, хранимых в кэше процесса
+CACHE_SIZE = 64
+
+# переменная окружения, задающая каталог кэша на диске
+CACHE_DIR_ENV = 'MIXING_MATRIX_CACHE_DIR'
+
+
+def matrix_digest(matrix: np.ndarray) -> str:
+    """Хэш содержимого матрицы в единично-нормальной форме."""
+    bits = np.ascontiguousarray(matrix > 0, dtype=np.uint8)
+    content = np.array(bits.shape, dtype='<i8').tobytes() + np.packbits(bits).tobytes()
+    return hashlib.sha256(content).hexdigest()[:16]
+
+
+class PowerMatrixCache:
+    """
+    LRU-кэш степеней перемешивающих матриц с необязательным хранением на диске.
+
+    Атрибуты экземпляров:
+        max_size: int           максимальное количество матриц в памяти
+        cache_dir: str          каталог кэша на диске, None - кэш только в памяти
+    """
+
+    def __init__(self, max_size: int = CACHE_SIZE, cache_dir: str = None):
+        self.max_size = max_size
+        self.cache_dir = cache_dir
+        self._matrices = OrderedDict()
+        self._one_round = {}
+
+    def _file_name(self, key: Tuple[str, int, str, int]) -> str:
+        transform, size, digest, power = key
+        return os.path.join(self.cache_dir, f'{transform}_{size}_{digest}_pow_{power}.npy')
+
+    def _load(self, key: Tuple[str, int, str, int]) -> BoolMatrix:
+        """Поиск матрицы в памяти, затем на диске, None при отсутствии."""
+        if key in self._matrices:
+            self._matrices.move_to_end(key)
+            return self._matrices[key]
+        if self.cache_dir:
+            file_name = self._file_name(key)
+            if os.path.exists(file_name):
+                matrix = BoolMatrix.from_ndarray(np.load(file_name))
+                self._store(key, matrix, to_disk=False)
+                return matrix
+        return None
+
+    def _store(self, key: Tuple[str, int, str, int], matrix: BoolMatrix, to_disk: bool = True) -> None:
+        self._matrices[key] = matrix
+        self._matrices.move_to_end(key)
+        while len(self._matrices) > self.max_size:
+            self._matrices.popitem(last=False)
+
+        if to_disk and self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+            # запись во временный файл и переименование, чтобы параллельные процессы не прочли недописанный файл
+            file_name = self._file_name(key)
+            tmp_name = f'{file_name}.{os.getpid()}.tmp'
+            with open(tmp_name, 'wb') as file:
+                np.save(file, matrix.to_ndarray(np.uint8))
+            os.replace(tmp_name, file_name)
+
+    def get_power(self, transform: str, size: int, power: int, construct: Callable[[int], np.ndarray]) -> np.ndarray:
+        """
+        Возвращает степень power перемешивающей матрицы преобразования transform для блока размера size.
+
+        construct: функция, строящая однораундовую перемешивающую матрицу преобразования по размеру блока
+        """
+        if power < 1:
+            raise Exception(
+                'Ошибка: степень перемешивающей матрицы не должна быть меньше 1')
+
+        if (transform, size) not in self._one_round:
+            one_round = construct(size)
+            self._one_round[(transform, size)] = (matrix_digest(one_round), BoolMatrix.from_ndarray(one_round))
+        digest, one_round = self._one_round[(transform, size)]
+
+        matrix = self._load((transform, size, digest, power))
+        if matrix is not None:
+            return matrix.to_ndarray()
+
+        # наибольшая имеющаяся в кэше меньшая степень
+        base_power, base = 1, one_round
+        for lower in range(power - 1, 1, -1):
+            cached = self._load((transform, size, digest, lower))
+            if cached is not None:
+                base_power, base = lower, cached
+                break
+
+        # последовательное вычисление недостающих степеней с сохранением каждой из них
+        for current in range(base_power + 1, power + 1):
+            base = base @ one_round
+            self._store((transform, size, digest, current), base)
+
+        return base.to_ndarray()
+
+    def clear(self) -> None:
+        """Очистка кэша в памяти (файлы на диске сохраняются)."""
+        self._matrices.clear()
+        self._one_round.clear()
+
+
+# общий кэш процесса, каталог на диске задается переменной окружения MIXING_MATRIX_CACHE_DIR
+matrix_cache = PowerMatrixCache(cache_dir=os.environ.get(CACHE_DIR_ENV) or None)
@@ -3,6 +3,8 @@ from typing import List
 
 import numpy as np
 
+from src.mixing_matrixes.block_matrix import BlockCompanionMatrix
+from src.mixing_matrixes.matrix_cache import matrix_cache
 from src.mixing_matrixes.utils import cast_matrix_to_identity_format, change_column_order, write_matrix_pretty
 
 
@@ -79,14 +81,14 @@ def construct_matrix_SPECK(size: int) -> np.ndarray:
     top_left = triangular
 
     top_right = left_betta_shift + triangular
-    top_right = cast_matrix_to_identity_format(top_right)
+    top_right = cast_matrix_to_identity_format(top_right, inplace=True)
 
     right_alpha_shift = np.zeros((half_size, half_size), dtype=np.int)
     for i in range(half_size):
         right_alpha_shift[i, (-(i + 1) + alpha + half_size) % half_size] = 1
 
     bottom_left = bottom_right = change_column_order(
-        change_column_order(right_alpha_shift) @ change_column_order(triangular))
+        change_column_order(right_alpha_shift) @ change_column_order(triangular), inplace=True)
 
     matrix_SPECK = np.zeros((half_size*2, half_size*2), dtype=np.int)
 
@@ -95,7 +97,7 @@ def construct_matrix_SPECK(size: int) -> np.ndarray:
     matrix_SPECK[half_size: size, 0: half_size] = bottom_left
     matrix_SPECK[half_size: size, half_size: size] = bottom_right
 
-    return change_column_order(matrix_SPECK)
+    return change_column_order(matrix_SPECK, inplace=True)
 
 
 def construct_mixing_matrix_pow_SPECK(power: int, size: int) -> np.ndarray:
@@ -103,14 +105,9 @@ def construct_mixing_matrix_pow_SPECK(power: int, size: int) -> np.ndarray:
         raise Exception(
             'Ошибка: степень перемешивающей матрицы не должна быть меньше 1')
 
-    matrix_SPECK_one_round = construct_matrix_SPECK(size)
-    matrix_SPECK_powed = construct_matrix_SPECK(size)
-
-    for _ in range(power - 1):
-        matrix_SPECK_powed = matrix_SPECK_powed @ matrix_SPECK_one_round
-        matrix_SPECK_powed = cast_matrix_to_identity_format(matrix_SPECK_powed)
-
-    return matrix_SPECK_powed
+    # степень зависит только от размера блока и показателя, поэтому берется из кэша,
+    # недостающие степени вычисляются над булевым полукольцом от наибольшей имеющейся
+    return matrix_cache.get_power('SPECK', size, power, construct_matrix_SPECK)
 
 
 def construct_matrix_MAG(r: int, n: int, pickup_points: List[int], mt_matrix: np.ndarray) -> np.ndarray:
@@ -149,7 +146,7 @@ def construct_matrix_MAG(r: int, n: int, pickup_points: List[int], mt_matrix: np
         # запись в итоговую матрицу подматрицы, отображающей зависимости от сдвига
         matrix[pos_x: pos_x + r, pos_y: pos_y + r] = shift_matrix
 
-    muled_matrix = cast_matrix_to_identity_format(addition_matrix @ mt_matrix)
+    muled_matrix = cast_matrix_to_identity_format(addition_matrix @ mt_matrix, inplace=True)
     # копирование перемешивающей подматрицы модифицирующего преобразования
     # в итоговую матрицу в позиции, соответсвующие точкам съема
     pos_y = (n - 1) * r
@@ -157,4 +154,24 @@ def construct_matrix_MAG(r: int, n: int, pickup_points: List[int], mt_matrix: np
         pos_x = point * r
         matrix[pos_x: pos_x + r, pos_y: pos_y + r] = muled_matrix
 
-    return matrix
\ No newline at end of file
+    return matrix
+
+
+def construct_block_matrix_MMLR(r: int, n: int, pickup_points: List[int], mt_matrix: np.ndarray) -> BlockCompanionMatrix:
+    """Строит перемешивающую матрицу модифицированного многомерного линейного генератора в блочном виде."""
+    return BlockCompanionMatrix(r, n, pickup_points, mt_matrix)
+
+
+def construct_block_matrix_MAG(r: int, n: int, pickup_points: List[int], mt_matrix: np.ndarray) -> BlockCompanionMatrix:
+    """Строит перемешивающую матрицу модифицированного аддитивного генератора в блочном виде."""
+
+    # проверка того, что размер ячейки генератора равен размеру матрицы модифицирующего преобразования
+    if r != mt_matrix.shape[0] or r != mt_matrix.shape[1]:
+        raise Exception(
+            'Ошибка: размер ячейки генератора не равен размеру матрицы модифицирующего преобразования')
+
+    # верхне-треугольная матрица сложения по модолю 2^r
+    addition_matrix = np.triu(np.ones((r, r), dtype=int))
+
+    muled_matrix = cast_matrix_to_identity_format(addition_matrix @ mt_matrix, inplace=True)
+    return BlockCompanionMatrix(r, n, pickup_points, muled_matrix)
@@ -1,64 +1,114 @@
 """В модуле реализованы функции для оценки перемешивающих свойств преобразований по их перемешивающим матрицам"""
-
+from typing import Callable, Union
 
 import numpy as np
-from src.mixing_matrixes.utils import cast_matrix_to_identity_format
 
+from src.mixing_matrixes.block_matrix import BlockCompanionMatrix
+from src.mixing_matrixes.bool_matrix import BoolMatrix
+
+
+def to_bool_matrix(matrix: Union[np.ndarray, BoolMatrix, BlockCompanionMatrix]) -> BoolMatrix:
+    """Приводит перемешивающую матрицу к упакованной булевой форме."""
+    if isinstance(matrix, BoolMatrix):
+        return matrix
+    if isinstance(matrix, BlockCompanionMatrix):
+        return matrix.to_bool_matrix()
+    return BoolMatrix.from_ndarray(matrix)
 
-def pow_matrix_gen(matrix: np.ndarray):
+
+def pow_matrix_gen(matrix: Union[np.ndarray, BoolMatrix]):
     """Питоновский генератор, последовательно возводящий матрицу в степень.
-    На каждой итерации матрица приводится к единично-нормальной форме.
+    Степени вычисляются над булевым полукольцом, поэтому сразу имеют единично-нормальную форму.
     """
-    powed_matrix = matrix.copy()
+    bool_matrix = to_bool_matrix(matrix)
+    powed_matrix = bool_matrix
     while True:
-        powed_matrix = cast_matrix_to_identity_format(powed_matrix)
         yield powed_matrix
-        powed_matrix = powed_matrix @ matrix
+        powed_matrix = powed_matrix @ bool_matrix
 
 
-def check_full_mixing(matrix: np.ndarray) -> bool:
+def check_full_mixing(matrix: BoolMatrix) -> bool:
     """Проверка того, что полное перемешивание достигнуто"""
-    size = matrix.shape[0]
-    for i in range(size):
-        for j in range(size):
-            if matrix[i, j] == 0:
-                return False
+    return matrix.is_full()
+
+
+def find_min_power(matrix: BoolMatrix, max_rounds: int, check: Callable[[BoolMatrix], bool]) -> int:
+    """Возвращает наименьшую степень k матрицы matrix, для которой выполнено check(matrix^k),
+    если такая степень превосходит max_rounds, вернет -1.
+
+    Свойство check должно быть монотонным: из check(matrix^k) следует check(matrix^(k+1)).
+    Сначала повторным возведением в квадрат строятся степени matrix^(2^i), пока свойство не выполнится,
+    затем искомая степень уточняется двоичным поиском между matrix^(2^(t-1)) и matrix^(2^t).
+    """
+    if check(matrix):
+        return 1
+
+    # squares[i] = matrix^(2^i)
+    squares = [matrix]
+    while (1 << (len(squares) - 1)) < max_rounds:
+        squares.append(squares[-1] @ squares[-1])
+        if check(squares[-1]):
+            break
     else:
-        return True
+        # свойство не выполнено для степени, не меньшей max_rounds
+        return -1
+
+    # наибольшая степень, для которой свойство заведомо не выполнено, и соответствующая матрица
+    t = len(squares) - 1
+    low = 1 << (t - 1)
+    low_matrix = squares[t - 1]
 
+    for i in range(t - 2, -1, -1):
+        candidate = low_matrix @ squares[i]
+        if not check(candidate):
+            low += 1 << i
+            low_matrix = candidate
 
-def get_exponent(mix_matr: np.ndarray, max_rounds: int) -> int:
+    return low + 1 if low + 1 <= max_rounds else -1
+
+
+def get_exponent(mix_matr: Union[np.ndarray, BoolMatrix, BlockCompanionMatrix], max_rounds: int) -> int:
     """Возвращает значение экспоненты для перемешивающей матрицы mix_matr,
     если число раундов превзошло max_rounds, вернет -1"""
-    i = 1
-    for m in pow_matrix_gen(mix_matr):
-        if check_full_mixing(m):
-            return i
-        i += 1
-        if i > max_rounds:
-            break
-    return -1
+
+    # для матрицы в блочном виде экспонент вычисляется без построения степеней всей матрицы
+    if isinstance(mix_matr, BlockCompanionMatrix):
+        return mix_matr.get_exponent(max_rounds)
+
+    matrix = to_bool_matrix(mix_matr)
+
+    # нулевой столбец сохраняется во всех степенях матрицы, иначе из полного перемешивания
+    # на k-ом раунде следует полное перемешивание на (k+1)-ом и применим двоичный поиск
+    if matrix.has_zero_column():
+        return -1
+    return find_min_power(matrix, max_rounds, check_full_mixing)
 
 
-def check_local_full_mixing(matr: np.ndarray, local_start: int, local_end: int) -> bool:
+def check_local_full_mixing(matr: BoolMatrix, local_start: int, local_end: int) -> bool:
     """Проверка того, что полное перемешивание достигнуто"""
-    size = matr.shape[0]
-    for i in range(size):
-        for j in range(local_start, local_end):
-            if matr[i, j] == 0:
-                return False
-    else:
-        return True
+    return matr.is_local_full(local_start, local_end)
 
 
-def get_local_exponent(mix_matr: np.ndarray, max_rounds: int, local_start: int, local_end: int) -> int:
+def get_local_exponent(
+        mix_matr: Union[np.ndarray, BoolMatrix, BlockCompanionMatrix],
+        max_rounds: int,
+        local_start: int,
+        local_end: int) -> int:
     """Возвращает значение экспоненты для перемешивающей матрицы mix_matr,
     если число раундов превзошло max_rounds, вернет -1"""
-    i = 1
-    for m in pow_matrix_gen(mix_matr):
-        if check_local_full_mixing(m, local_start, local_end):
-            return i
-        i += 1
-        if i > max_rounds:
-            break
-    return -1
+    if isinstance(mix_matr, BlockCompanionMatrix):
+        return mix_matr.get_local_exponent(max_rounds, local_start, local_end)
+
+    # для пустого диапазона столбцов условие перемешивания выполнено уже на первом раунде
+    if local_start >= local_end:
+        return 1
+
+    matrix = to_bool_matrix(mix_matr)
+
+    # нулевая строка сохраняется во всех степенях матрицы, иначе локальное перемешивание монотонно
+    if matrix.has_zero_row():
+        return -1
+    return find_min_power(
+        matrix,
+        max_rounds,
+        lambda m: check_local_full_mixing(m, local_start, local_end))
@@ -3,29 +3,22 @@ import numpy as np
 import  os
 
 
-def change_column_order(matrix: np.ndarray) -> np.ndarray:
-    """Изменение порядка столбцов в матрице"""
-    shape = matrix.shape
-    new_matrix = np.zeros(shape, dtype=np.int)
-
-    for i in range(shape[1]):
-        new_matrix[0: shape[0], i: i + 1] = matrix[0: shape[0],
-                                                   shape[1] - i - 1: shape[1] - i]
-
-    return new_matrix
-
-
-def cast_matrix_to_identity_format(matrix: np.ndarray) -> np.ndarray:
-    """Заменяет все элементы матрицы большие нуля на 1."""
-    shape = matrix.shape
-    new_matrix = np.zeros(shape, dtype=np.int)
-
-    for i in range(shape[0]):
-        for j in range(shape[1]):
-            if matrix[i, j] > 0:
-                new_matrix[i, j] = 1
-
-    return new_matrix
+def change_column_order(matrix: np.ndarray, inplace: bool = False) -> np.ndarray:
+    """Изменение порядка столбцов в матрице на обратный.
+    При inplace=True столбцы переставляются в самой матрице matrix, иначе создается новая матрица."""
+    if inplace:
+        matrix[:] = matrix[:, ::-1]
+        return matrix
+    return matrix[:, ::-1].copy()
+
+
+def cast_matrix_to_identity_format(matrix: np.ndarray, inplace: bool = False) -> np.ndarray:
+    """Заменяет все элементы матрицы большие нуля на 1, остальные на 0.
+    При inplace=True замена производится в самой матрице matrix, иначе создается новая матрица."""
+    if inplace:
+        np.greater(matrix, 0, out=matrix)
+        return matrix
+    return (matrix > 0).astype(matrix.dtype)
 
 
 def make_pretty_matrix(matrix: np.ndarray) -> str:
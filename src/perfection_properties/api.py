@@ -1,8 +1,17 @@
-from src.perfection_properties.perfection_check import get_GEN_class_perfection_power
+from src.perfection_properties.bulk_perfection_check import (get_GEN_class_perfection_power_adaptive,
+                                                             get_GEN_class_perfection_power_bulk)
+from src.perfection_properties.sampling import SampleSource
+from src.perfection_properties.dependency_rounds import (get_coverage, get_GEN_class_dependency_masks,
+                                                         get_local_perfection_power_from_masks,
+                                                         get_perfection_power_from_masks)
+from src.perfection_properties.structural_perfection import get_GEN_class_perfection_power_structural
+from src.mixing_matrixes.matrixes_generation import construct_mixing_matrix_pow_SPECK
 from src.generators.mag import MAG
 from src.generators.mmlr import MMLR
-from src.algorythms.speck import enc_SPECK32_wt_key
+from src.algorythms.speck import enc_SPECK32_wt_key, enc_SPECK_array
+from functools import partial
 from typing import List
+import numpy as np
 
 class PerfectionCmdAPI:
     def calculate_perf_pow_for_MMLR_SPECK_api(
@@ -11,7 +20,9 @@ class PerfectionCmdAPI:
             n: int,
             pickup_points: List[int],
             max_rounds: int,
-            samples_num: int
+            samples_num: int,
+            seed: int = None,
+            strategy: str = 'uniform'
         ) -> None:
         """Расчет показателя совершенности для преобразования ММЛГ с модифицирующим преобразованием одно-раундовым SPECK и вывод на экран.
         Параметры:
@@ -19,9 +30,14 @@ class PerfectionCmdAPI:
             n:              количество ячеек ММЛГ.
             pickup_points:  список точек съема, допустимый диапазон - 0 <= x < n.
             max_rounds:     максимальое число раундов, до которого искать экспонент.
-            samples_num:    количество пар соседних векторов, на которых будет происходить проверка."""
-        perf_pow = get_GEN_class_perfection_power(n, r, pickup_points, enc_SPECK32_wt_key, samples_num, max_rounds, MMLR)
-        print(f'Показатель совершенности = {perf_pow}')
+            samples_num:    количество пар соседних векторов, на которых будет происходить проверка.
+            seed:           начальное значение генератора векторов для повторения эксперимента, по умолчанию - случайное.
+            strategy:       стратегия формирования векторов: uniform, low_weight или balanced (см. SampleSource)."""
+        sample_source = SampleSource(n * r, strategy, seed)
+        perf_pow = get_GEN_class_perfection_power_bulk(
+            n, r, pickup_points, enc_SPECK32_wt_key, samples_num, max_rounds, MMLR, sample_source=sample_source,
+            retire_saturated=False, shared_baseline=True)
+        print(f'Показатель совершенности = {perf_pow} (seed = {sample_source.seed})')
     
     def calculate_perf_pow_for_MAG_SPECK_api(
             self,
@@ -29,7 +45,9 @@ class PerfectionCmdAPI:
             n: int,
             pickup_points: List[int],
             max_rounds: int,
-            samples_num: int
+            samples_num: int,
+            seed: int = None,
+            strategy: str = 'uniform'
         ) -> None:
         """Расчет показателя совершенности для преобразования МАГ с модифицирующим преобразованием одно-раундовым SPECK и вывод на экран.
         Параметры:
@@ -37,6 +55,207 @@ class PerfectionCmdAPI:
             n:              количество ячеек МАГ.
             pickup_points:  список точек съема, допустимый диапазон - 0 <= x < n.
             max_rounds:     максимальое число раундов, до которого искать экспонент.
-            samples_num:    количество пар соседних векторов, на которых будет происходить проверка."""
-        perf_pow = get_GEN_class_perfection_power(n, r, pickup_points, enc_SPECK32_wt_key, samples_num, max_rounds, MAG)
-        print(f'Показатель совершенности = {perf_pow}')
\ No newline at end of file
+            samples_num:    количество пар соседних векторов, на которых будет происходить проверка.
+            seed:           начальное значение генератора векторов для повторения эксперимента, по умолчанию - случайное.
+            strategy:       стратегия формирования векторов: uniform, low_weight или balanced (см. SampleSource)."""
+        sample_source = SampleSource(n * r, strategy, seed)
+        perf_pow = get_GEN_class_perfection_power_bulk(
+            n, r, pickup_points, enc_SPECK32_wt_key, samples_num, max_rounds, MAG, sample_source=sample_source,
+            retire_saturated=False, shared_baseline=True)
+        print(f'Показатель совершенности = {perf_pow} (seed = {sample_source.seed})')
+
+    def calculate_adaptive_perf_pow_for_MMLR_SPECK_api(
+            self,
+            r: int,
+            n: int,
+            pickup_points: List[int],
+            max_rounds: int,
+            confidence: float,
+            seed: int = None,
+            strategy: str = 'uniform'
+        ) -> None:
+        """Расчет показателя совершенности для преобразования ММЛГ с модифицирующим преобразованием одно-раундовым SPECK
+        с адаптивным выбором количества пар соседних векторов и вывод на экран.
+        Параметры:
+            r:              размер ячейки ММЛГ в битах.
+            n:              количество ячеек ММЛГ.
+            pickup_points:  список точек съема, допустимый диапазон - 0 <= x < n.
+            max_rounds:     максимальое число раундов, до которого искать показатель.
+            confidence:     вероятность одновременного обнаружения всех зависимостей, проявляющихся хотя бы для 5% векторов,
+                            например 0.99.
+            seed:           начальное значение генератора векторов для повторения эксперимента, по умолчанию - случайное.
+            strategy:       стратегия формирования векторов: uniform, low_weight или balanced (см. SampleSource)."""
+        sample_source = SampleSource(n * r, strategy, seed)
+        perf_pow, samples_num = get_GEN_class_perfection_power_adaptive(
+            n, r, pickup_points, enc_SPECK32_wt_key, max_rounds, MMLR, confidence=confidence, sample_source=sample_source)
+        print(f'Показатель совершенности = {perf_pow}, сформировано векторов = {samples_num} '
+              f'(seed = {sample_source.seed})')
+
+    def calculate_adaptive_perf_pow_for_MAG_SPECK_api(
+            self,
+            r: int,
+            n: int,
+            pickup_points: List[int],
+            max_rounds: int,
+            confidence: float,
+            seed: int = None,
+            strategy: str = 'uniform'
+        ) -> None:
+        """Расчет показателя совершенности для преобразования МАГ с модифицирующим преобразованием одно-раундовым SPECK
+        с адаптивным выбором количества пар соседних векторов и вывод на экран.
+        Параметры:
+            r:              размер ячейки МАГ в битах.
+            n:              количество ячеек МАГ.
+            pickup_points:  список точек съема, допустимый диапазон - 0 <= x < n.
+            max_rounds:     максимальое число раундов, до которого искать показатель.
+            confidence:     вероятность одновременного обнаружения всех зависимостей, проявляющихся хотя бы для 5% векторов,
+                            например 0.99.
+            seed:           начальное значение генератора векторов для повторения эксперимента, по умолчанию - случайное.
+            strategy:       стратегия формирования векторов: uniform, low_weight или balanced (см. SampleSource)."""
+        sample_source = SampleSource(n * r, strategy, seed)
+        perf_pow, samples_num = get_GEN_class_perfection_power_adaptive(
+            n, r, pickup_points, enc_SPECK32_wt_key, max_rounds, MAG, confidence=confidence, sample_source=sample_source)
+        print(f'Показатель совершенности = {perf_pow}, сформировано векторов = {samples_num} '
+              f'(seed = {sample_source.seed})')
+
+    def calculate_structural_perf_pow_for_MMLR_SPECK_api(
+            self,
+            r: int,
+            n: int,
+            pickup_points: List[int],
+            max_rounds: int,
+            verify_samples: int,
+            seed: int = None,
+            strategy: str = 'uniform'
+        ) -> None:
+        """Расчет показателя совершенности для преобразования ММЛГ с модифицирующим преобразованием одно-раундовым SPECK
+        по экспоненту перемешивающей матрицы (нижняя граница показателя) и вывод на экран.
+        Параметры:
+            r:              размер ячейки ММЛГ в битах, равен размеру блока SPECK: 32, 48, 64, 96 или 128.
+            n:              количество ячеек ММЛГ.
+            pickup_points:  список точек съема, допустимый диапазон - 0 <= x < n.
+            max_rounds:     максимальое число раундов, до которого искать показатель.
+            verify_samples: количество пар соседних векторов для проверки моделированием, 0 - без проверки.
+            seed:           начальное значение генератора векторов для повторения эксперимента, по умолчанию - случайное.
+            strategy:       стратегия формирования векторов: uniform, low_weight или balanced (см. SampleSource)."""
+        # перемешивающая матрица и моделируемое преобразование - SPECK с размером блока r
+        # (construct_mixing_matrix_pow_SPECK отвергает неподдерживаемые размеры блока)
+        mf_matrix = construct_mixing_matrix_pow_SPECK(1, r)
+        mf = partial(enc_SPECK_array, block_size=r)
+        sample_source = SampleSource(n * r, strategy, seed)
+        perf_pow, verified = get_GEN_class_perfection_power_structural(
+            n, r, pickup_points, mf, mf_matrix, max_rounds, MMLR, verify_samples, sample_source)
+        if verified:
+            print(f'Показатель совершенности = {perf_pow}')
+        elif not verify_samples:
+            print(f'Экспонент перемешивающей матрицы (нижняя граница показателя совершенности, без проверки) = '
+                  f'{perf_pow}')
+        else:
+            print(f'Показатель совершенности (моделирование, не совпал с экспонентом) = {perf_pow} '
+                  f'(seed = {sample_source.seed})')
+
+    def calculate_structural_perf_pow_for_MAG_SPECK_api(
+            self,
+            r: int,
+            n: int,
+            pickup_points: List[int],
+            max_rounds: int,
+            verify_samples: int,
+            seed: int = None,
+            strategy: str = 'uniform'
+        ) -> None:
+        """Расчет показателя совершенности для преобразования МАГ с модифицирующим преобразованием одно-раундовым SPECK
+        по экспоненту перемешивающей матрицы (нижняя граница показателя) и вывод на экран.
+        Параметры:
+            r:              размер ячейки МАГ в битах, равен размеру блока SPECK: 32, 48, 64, 96 или 128.
+            n:              количество ячеек МАГ.
+            pickup_points:  список точек съема, допустимый диапазон - 0 <= x < n.
+            max_rounds:     максимальое число раундов, до которого искать показатель.
+            verify_samples: количество пар соседних векторов для проверки моделированием, 0 - без проверки.
+            seed:           начальное значение генератора векторов для повторения эксперимента, по умолчанию - случайное.
+            strategy:       стратегия формирования векторов: uniform, low_weight или balanced (см. SampleSource)."""
+        # перемешивающая матрица и моделируемое преобразование - SPECK с размером блока r
+        # (construct_mixing_matrix_pow_SPECK отвергает неподдерживаемые размеры блока)
+        mf_matrix = construct_mixing_matrix_pow_SPECK(1, r)
+        mf = partial(enc_SPECK_array, block_size=r)
+        sample_source = SampleSource(n * r, strategy, seed)
+        perf_pow, verified = get_GEN_class_perfection_power_structural(
+            n, r, pickup_points, mf, mf_matrix, max_rounds, MAG, verify_samples, sample_source)
+        if verified:
+            print(f'Показатель совершенности = {perf_pow}')
+        elif not verify_samples:
+            print(f'Экспонент перемешивающей матрицы (нижняя граница показателя совершенности, без проверки) = '
+                  f'{perf_pow}')
+        else:
+            print(f'Показатель совершенности (моделирование, не совпал с экспонентом) = {perf_pow} '
+                  f'(seed = {sample_source.seed})')
+
+    def calculate_dependency_rounds_for_MMLR_SPECK_api(
+            self,
+            r: int,
+            n: int,
+            pickup_points: List[int],
+            max_rounds: int,
+            samples_num: int,
+            file_path: str,
+            seed: int = None,
+            strategy: str = 'uniform'
+        ) -> None:
+        """Построение масок зависимостей по раундам для преобразования ММЛГ с модифицирующим преобразованием
+        одно-раундовым SPECK, сохранение их в файл .npy и вывод на экран показателя совершенности, локальных показателей
+        для ячеек и доли выполненных зависимостей по раундам.
+        Параметры:
+            r:              размер ячейки ММЛГ в битах.
+            n:              количество ячеек ММЛГ.
+            pickup_points:  список точек съема, допустимый диапазон - 0 <= x < n.
+            max_rounds:     максимальое число раундов, до которого искать зависимости.
+            samples_num:    количество пар соседних векторов, на которых будет происходить проверка.
+            file_path:      путь к файлу для сохранения масок.
+            seed:           начальное значение генератора векторов для повторения эксперимента, по умолчанию - случайное.
+            strategy:       стратегия формирования векторов: uniform, low_weight или balanced (см. SampleSource)."""
+        sample_source = SampleSource(n * r, strategy, seed)
+        masks = get_GEN_class_dependency_masks(
+            n, r, pickup_points, enc_SPECK32_wt_key, samples_num, max_rounds, MMLR, sample_source=sample_source)
+        np.save(file_path, masks)
+        print(f'Показатель совершенности = {get_perfection_power_from_masks(masks, r)} '
+              f'(seed = {sample_source.seed})')
+        for cell in range(n):
+            local_perf_pow = get_local_perfection_power_from_masks(masks, r, r * cell, r * (cell + 1))
+            print(f'Локальный показатель совершенности для ячейки {cell} = {local_perf_pow}')
+        for round, coverage in enumerate(get_coverage(masks, r)):
+            print(f'Раунд {round + 1}: выполнено зависимостей {coverage:.2%}')
+
+    def calculate_dependency_rounds_for_MAG_SPECK_api(
+            self,
+            r: int,
+            n: int,
+            pickup_points: List[int],
+            max_rounds: int,
+            samples_num: int,
+            file_path: str,
+            seed: int = None,
+            strategy: str = 'uniform'
+        ) -> None:
+        """Построение масок зависимостей по раундам для преобразования МАГ с модифицирующим преобразованием
+        одно-раундовым SPECK, сохранение их в файл .npy и вывод на экран показателя совершенности, локальных показателей
+        для ячеек и доли выполненных зависимостей по раундам.
+        Параметры:
+            r:              размер ячейки МАГ в битах.
+            n:              количество ячеек МАГ.
+            pickup_points:  список точек съема, допустимый диапазон - 0 <= x < n.
+            max_rounds:     максимальое число раундов, до которого искать зависимости.
+            samples_num:    количество пар соседних векторов, на которых будет происходить проверка.
+            file_path:      путь к файлу для сохранения масок.
+            seed:           начальное значение генератора векторов для повторения эксперимента, по умолчанию - случайное.
+            strategy:       стратегия формирования векторов: uniform, low_weight или balanced (см. SampleSource)."""
+        sample_source = SampleSource(n * r, strategy, seed)
+        masks = get_GEN_class_dependency_masks(
+            n, r, pickup_points, enc_SPECK32_wt_key, samples_num, max_rounds, MAG, sample_source=sample_source)
+        np.save(file_path, masks)
+        print(f'Показатель совершенности = {get_perfection_power_from_masks(masks, r)} '
+              f'(seed = {sample_source.seed})')
+        for cell in range(n):
+            local_perf_pow = get_local_perfection_power_from_masks(masks, r, r * cell, r * (cell + 1))
+            print(f'Локальный показатель совершенности для ячейки {cell} = {local_perf_pow}')
+        for round, coverage in enumerate(get_coverage(masks, r)):
+            print(f'Раунд {round + 1}: выполнено зависимостей {coverage:.2%}')
@@ -0,0 +1,371 @@
+"""Пакетная оценка показателя совершенности генераторов ММЛГ и МАГ.
+
+Вместо 2 * n * r * samples_num объектов генераторов состояния всех пар генераторов хранятся в одном массиве
+numpy размера (2, n * r, samples_num, n): пара соседних по координате i векторов для sample, ячейки регистра
+по последней оси (ячейка 0 - младшие r бит состояния). Такт работы выполняется сразу для всех генераторов:
+значения в точках съема объединяются (xor для ММЛГ, сложение по модулю 2^r для МАГ), к результату применяется
+модифицирующее преобразование, регистр сдвигается в сторону младшей ячейки.
+
+Модифицирующее преобразование mf должно поэлементно применяться к массиву numpy чисел типа uint64
+(как функции модуля src.algorythms.speck) и отображать r-битные числа в r-битные. Значения ячеек размера
+больше 64 бит (до 128 бит) задаются парами чисел uint64 по дополнительной последней оси массива
+(см. src.generators.cells), как блоки SPECK96 и SPECK128 в enc_SPECK_array.
+"""
+import math
+from typing import Callable, List, Tuple, Union
+
+import numpy as np
+
+from src.generators.cells import (add_wide_cells, check_cell_size, get_cell_axis, get_cell_mask, get_cell_shape,
+                                  get_coordinate_index, is_wide, split_cells)
+from src.generators.mag import MAG
+from src.generators.mmlr import MMLR
+from src.perfection_properties.perfection_check import gen_random_samples
+from src.perfection_properties.sampling import SampleSource
+
+
+def form_neighbor_states(
+    samples: Union[List[int], np.ndarray],
+    r: int,
+    n: int,
+    coordinates: np.ndarray = None
+) -> np.ndarray:
+    """Формирует массив состояний размера (2, len(coordinates), len(samples), n), в котором states[0, c, s]
+    и states[1, c, s] - соседние по координате coordinates[c] векторы для samples[s] с 1 и с 0 на этой позиции
+    соответственно (как get_neighbor_numbers). По умолчанию coordinates - все n * r координат.
+    samples - список чисел или массив значений ячеек размера (len(samples), n) (см. SampleSource.cells).
+    Для ячеек размера больше 64 бит у массивов дополнительная последняя ось длины 2."""
+    if coordinates is None:
+        coordinates = np.arange(n * r)
+    rows = np.arange(len(coordinates))
+    index, bits = get_coordinate_index(coordinates, r)
+
+    states = np.empty((2, len(coordinates), len(samples), n) + get_cell_shape(r), dtype=np.uint64)
+    states[:] = samples if isinstance(samples, np.ndarray) else split_cells(samples, r, n)
+    states[(0, rows, slice(None)) + index] |= bits
+    states[(1, rows, slice(None)) + index] &= ~bits
+    return states
+
+
+def form_flipped_states(
+    samples: Union[List[int], np.ndarray],
+    r: int,
+    n: int,
+    coordinates: np.ndarray = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Формирует массив базовых состояний размера (len(samples), n) и массив состояний размера
+    (len(coordinates), len(samples), n), в котором flipped[c, s] отличается от samples[s] в координате coordinates[c].
+    Пара (base[s], flipped[c, s]) совпадает с парой соседних векторов form_neighbor_states с точностью до порядка,
+    поэтому разности состояний те же, а моделируется len(coordinates) + 1 состояние на sample вместо 2 * len(coordinates)."""
+    if coordinates is None:
+        coordinates = np.arange(n * r)
+    rows = np.arange(len(coordinates))
+    index, bits = get_coordinate_index(coordinates, r)
+
+    base = np.array(samples if isinstance(samples, np.ndarray) else split_cells(samples, r, n), dtype=np.uint64)
+    flipped = np.empty((len(coordinates),) + base.shape, dtype=np.uint64)
+    flipped[:] = base
+    flipped[(rows, slice(None)) + index] ^= bits
+    return base, flipped
+
+
+def xor_cells(values: np.ndarray, r: int) -> np.ndarray:
+    """xor значений точек съема, расположенных по оси ячеек"""
+    return np.bitwise_xor.reduce(values, axis=get_cell_axis(r))
+
+
+def add_cells(values: np.ndarray, r: int) -> np.ndarray:
+    """Сложение по модулю 2^r значений точек съема, расположенных по оси ячеек"""
+    if is_wide(r):
+        result = values[..., 0, :]
+        for i in range(1, values.shape[-2]):
+            result = add_wide_cells(result, values[..., i, :], r)
+        return result
+
+    # сложение в uint64 выполняется по модулю 2^64, поэтому достаточно взять младшие r бит суммы
+    return np.add.reduce(values, axis=-1, dtype=np.uint64) & get_cell_mask(r)
+
+
+# функции объединения значений точек съема для классов генераторов
+FEEDBACK_FUNCS = {
+    MMLR: xor_cells,
+    MAG: add_cells,
+}
+
+
+def do_cycle(
+    states: np.ndarray,
+    r: int,
+    pp: List[int],
+    mf: Callable,
+    feedback_func: Callable[[np.ndarray, int], np.ndarray]
+) -> None:
+    """Производит один цикл работы всех генераторов, состояния которых заданы массивом states (ячейки по оси
+    get_cell_axis(r))"""
+    feedback = feedback_func(np.take(states, pp, axis=get_cell_axis(r)), r)
+    modified_val = np.asarray(mf(feedback), dtype=np.uint64) & get_cell_mask(r)
+
+    # сдвиг регистров в сторону младшей ячейки и запись нового значения в старшую ячейку
+    if is_wide(r):
+        states[..., :-1, :] = states[..., 1:, :]
+        states[..., -1, :] = modified_val
+    else:
+        states[..., :-1] = states[..., 1:]
+        states[..., -1] = modified_val
+
+
+def is_full_mask(masks: np.ndarray, r: int) -> np.ndarray:
+    """Признак того, что маски (ячейки по оси get_cell_axis(r)) состоят из единиц во всех ячейках"""
+    full = masks == get_cell_mask(r)
+    return full.all(axis=(-2, -1)) if is_wide(r) else full.all(axis=-1)
+
+
+def get_saturated_coordinates(states: np.ndarray, r: int) -> np.ndarray:
+    """Возвращает для каждой входной координаты i признак того, что изменение i-ой координаты хотя бы для одного
+    sample изменяет каждую выходную координату"""
+    return is_full_mask(get_round_masks(states, r), r)
+
+
+def get_round_masks(states: np.ndarray, r: int) -> np.ndarray:
+    """Возвращает для каждой входной координаты OR по всем sample разностей состояний пар,
+    размер (coordinates, n) + get_cell_shape(r)"""
+    return np.bitwise_or.reduce(states[0] ^ states[1], axis=1)
+
+
+def get_flipped_masks(base: np.ndarray, flipped: np.ndarray) -> np.ndarray:
+    """То же, что и get_round_masks, для состояний, полученных form_flipped_states"""
+    return np.bitwise_or.reduce(flipped ^ base, axis=1)
+
+
+def check_current_round(states: np.ndarray, r: int) -> bool:
+    """Проверка того, что для данного раунда преобразование совершенно"""
+    return bool(get_saturated_coordinates(states, r).all())
+
+
+def get_GEN_class_perfection_power_bulk(
+    n: int,
+    r: int,
+    pp: List[int],
+    mf: Callable,
+    samples_num: int,
+    max_rounds: int,
+    GEN_class: Union[MAG, MMLR],
+    samples: List[int] = None,
+    retire_saturated: bool = False,
+    sample_source: SampleSource = None,
+    shared_baseline: bool = False
+) -> int:
+    """
+    Определяет показатель совершенности генератора, то же, что и get_GEN_class_perfection_power.
+    Параметры:
+        n:              количество ячеек генератора
+        r:              размер ячейки в битах, не более 128 (больше 64 - четный)
+        pp:             список точек съема
+        mf:             модифицирующее преобразование, применяемое поэлементно к массиву numpy
+        samples_num:    количество пар соседних векторов, на которых будет происходить проверка
+        max_rounds:     максимальное число раундов, до которого стоит пытаться определить показатель
+        GEN_class:      класс генератора (MMLR или MAG)
+        samples:        векторы, для которых формируются пары соседних, по умолчанию - samples_num случайных векторов
+        retire_saturated: исключать из моделирования входные координаты, изменение которых изменило
+                        все выходные координаты, показатель при этом может быть меньше
+                        (см. get_GEN_class_perfection_power), по умолчанию не исключать
+        sample_source:  источник векторов с известным seed, по умолчанию - gen_random_samples
+        shared_baseline: моделировать одно базовое состояние на sample и n * r состояний с измененной координатой
+                        (form_flipped_states) вместо n * r пар соседних векторов: модифицирующее преобразование
+                        вычисляется почти вдвое реже, маски зависимостей те же
+    """
+    check_cell_size(r)
+    if GEN_class not in FEEDBACK_FUNCS:
+        raise Exception('Ошибка: неизвестный класс генератора')
+
+    # сформируем samples_num случайных чисел для формирования из них пар соседних векторов
+    if samples is None:
+        if sample_source is None:
+            samples = gen_random_samples(n * r, samples_num)
+        else:
+            samples = sample_source.cells(samples_num, r, n)
+
+    if shared_baseline:
+        base, states = form_flipped_states(samples, r, n)
+    else:
+        states = form_neighbor_states(samples, r, n)
+
+    for round in range(max_rounds):
+        if shared_baseline:
+            do_cycle(base, r, pp, mf, FEEDBACK_FUNCS[GEN_class])
+            do_cycle(states, r, pp, mf, FEEDBACK_FUNCS[GEN_class])
+            saturated = is_full_mask(get_flipped_masks(base, states), r)
+        else:
+            do_cycle(states, r, pp, mf, FEEDBACK_FUNCS[GEN_class])
+            saturated = get_saturated_coordinates(states, r)
+        if saturated.all():
+            return round + 1
+
+        # моделирование продолжается только для ненасыщенных координат
+        if retire_saturated and saturated.any():
+            states = states[~saturated] if shared_baseline else states[:, ~saturated]
+    return -1
+
+
+def get_first_saturated_rounds(masks: np.ndarray, r: int) -> np.ndarray:
+    """По накопленным маскам размера (coordinates, rounds, n) + get_cell_shape(r) возвращает для каждой координаты
+    номер (с 1) первого раунда, на котором ее маска состоит из единиц, или -1"""
+    saturated = is_full_mask(masks, r)
+    return np.where(saturated.any(axis=1), saturated.argmax(axis=1) + 1, -1)
+
+
+def get_GEN_class_perfection_power_adaptive(
+    n: int,
+    r: int,
+    pp: List[int],
+    mf: Callable,
+    max_rounds: int,
+    GEN_class: Union[MAG, MMLR],
+    batch_size: int = 16,
+    max_samples: int = 1024,
+    confidence: float = 0.99,
+    min_flip_prob: float = 0.05,
+    sample_source: SampleSource = None
+) -> Tuple[int, int]:
+    """
+    Определяет показатель совершенности генератора с адаптивным выбором количества пар соседних векторов.
+
+    Для каждой входной координаты i и раунда t накапливается маска masks[i, t] - OR разностей пар по всем
+    рассмотренным sample. Показатель - первый раунд, на котором маски всех координат состоят из единиц
+    (как get_GEN_class_perfection_power_bulk с retire_saturated=False). Добавление sample может только уменьшить
+    показатель, поэтому новые пакеты из batch_size векторов моделируются только на раундах, меньших текущего
+    показателя, и только для координат, маска которых хотя бы на одном из этих раундов не состоит из единиц.
+
+    Критерий остановки - количество векторов k, при котором каждая из M = (n * r)^2 * max_rounds зависимостей
+    (входная координата, выходная координата, раунд), проявляющаяся хотя бы для доли min_flip_prob векторов,
+    не обнаруживается с вероятностью не более (1 - confidence) / M: (1 - min_flip_prob)^k <= (1 - confidence) / M.
+    Тогда по неравенству Буля все такие зависимости обнаруживаются одновременно с вероятностью не менее confidence,
+    и показатель не завышен из-за нехватки векторов. Количество векторов ограничено max_samples.
+
+    sample_source - источник векторов с известным seed, по умолчанию - gen_random_samples.
+    Пакеты моделируются с общими базовыми состояниями (form_flipped_states).
+
+    Возвращает показатель совершенности и общее количество сформированных векторов (sample).
+    """
+    check_cell_size(r)
+    if GEN_class not in FEEDBACK_FUNCS:
+        raise Exception('Ошибка: неизвестный класс генератора')
+    if not 0 < confidence < 1 or not 0 < min_flip_prob < 1:
+        raise Exception('Ошибка: confidence и min_flip_prob должны лежать в интервале (0, 1)')
+
+    length = n * r
+    hypotheses = length * length * max_rounds
+    required = min(max_samples, math.ceil(math.log((1 - confidence) / hypotheses) / math.log(1 - min_flip_prob)))
+
+    masks = np.zeros((length, max_rounds, n) + get_cell_shape(r), dtype=np.uint64)
+
+    coordinates = np.arange(length)
+    rounds = max_rounds
+    perf_pow = -1
+    used = 0
+    while used < required and coordinates.size and rounds > 0:
+        # новый пакет векторов моделируется для выбранных координат на первых rounds раундах
+        if sample_source is None:
+            batch = gen_random_samples(length, batch_size)
+        else:
+            batch = sample_source.cells(batch_size, r, n)
+        base, flipped = form_flipped_states(batch, r, n, coordinates)
+        for round in range(rounds):
+            do_cycle(base, r, pp, mf, FEEDBACK_FUNCS[GEN_class])
+            do_cycle(flipped, r, pp, mf, FEEDBACK_FUNCS[GEN_class])
+            masks[coordinates, round] |= get_flipped_masks(base, flipped)
+        used += batch_size
+
+        full = is_full_mask(masks, r)
+        perfect = full.all(axis=0)
+        perf_pow = int(perfect.argmax()) + 1 if perfect.any() else -1
+
+        # раунды, меньшие текущего показателя, и координаты, не насыщенные хотя бы на одном из них
+        rounds = max_rounds if perf_pow == -1 else perf_pow - 1
+        coordinates = np.flatnonzero(~full[:, :rounds].all(axis=1))
+
+    return perf_pow, used
+
+
+# ограничение памяти для состояний одной порции по умолчанию, байт
+DEFAULT_MAX_MEMORY = 1 << 28
+
+
+def get_chunk_sizes(n: int, r: int, pp: List[int], samples_num: int, max_memory: int) -> Tuple[int, int]:
+    """Возвращает количество координат и количество sample в одной порции так, чтобы состояния порции
+    и временные массивы такта работы занимали не более max_memory байт"""
+    # на пару (координата, sample): состояние, копия при сдвиге, разность с базовым состоянием
+    # и значения точек съема, по 8 байт на ячейку
+    pair_bytes = 8 * (3 * n + len(pp)) * (2 if is_wide(r) else 1)
+    pairs = max(1, max_memory // pair_bytes)
+    coordinates_chunk = min(n * r, pairs)
+    samples_chunk = max(1, min(samples_num, pairs // coordinates_chunk))
+    return coordinates_chunk, samples_chunk
+
+
+def get_GEN_class_perfection_power_chunked(
+    n: int,
+    r: int,
+    pp: List[int],
+    mf: Callable,
+    samples_num: int,
+    max_rounds: int,
+    GEN_class: Union[MAG, MMLR],
+    max_memory: int = DEFAULT_MAX_MEMORY,
+    samples: Union[List[int], np.ndarray] = None,
+    retire_saturated: bool = False,
+    sample_source: SampleSource = None
+) -> int:
+    """
+    Определяет показатель совершенности генератора, то же, что и get_GEN_class_perfection_power_bulk,
+    моделируя пары соседних векторов порциями по координатам и sample (get_chunk_sizes), размер состояний порции
+    не превышает max_memory байт. Векторы формируются по мере обработки порций.
+
+    Для каждой входной координаты i и раунда t маски masks[i, t] - OR разностей пар - объединяются по всем порциям
+    (массив размера (n * r, max_rounds, n) + get_cell_shape(r) хранится целиком). Порция моделируется только на раундах, меньших
+    текущей оценки показателя: объединение масок с последующими порциями может ее только уменьшить.
+    """
+    check_cell_size(r)
+    if GEN_class not in FEEDBACK_FUNCS:
+        raise Exception('Ошибка: неизвестный класс генератора')
+
+    length = n * r
+    if samples is not None:
+        samples_num = len(samples)
+    coordinates_chunk, samples_chunk = get_chunk_sizes(n, r, pp, samples_num, max_memory)
+
+    masks = np.zeros((length, max_rounds, n) + get_cell_shape(r), dtype=np.uint64)
+
+    def get_perf_pow(coordinates: np.ndarray) -> np.ndarray:
+        """Оценка показателя по текущим маскам для координат: номер раунда с 1 или -1"""
+        if retire_saturated:
+            return get_first_saturated_rounds(masks[coordinates], r)
+        # без исключения насыщенных координат показатель - первый раунд, на котором насыщены все координаты
+        perfect = is_full_mask(masks, r).all(axis=0)
+        perf_pow = int(perfect.argmax()) + 1 if perfect.any() else -1
+        return np.full(len(coordinates), perf_pow)
+
+    for start in range(0, samples_num, samples_chunk):
+        end = min(start + samples_chunk, samples_num)
+        if samples is not None:
+            batch = samples[start: end]
+        elif sample_source is None:
+            batch = gen_random_samples(length, end - start)
+        else:
+            batch = sample_source.cells(end - start, r, n)
+
+        for coordinates_start in range(0, length, coordinates_chunk):
+            coordinates = np.arange(coordinates_start, min(coordinates_start + coordinates_chunk, length))
+            perf_pow = get_perf_pow(coordinates)
+            rounds = max_rounds if (perf_pow == -1).any() else int(perf_pow.max()) - 1
+            if rounds <= 0:
+                continue
+
+            base, flipped = form_flipped_states(batch, r, n, coordinates)
+            for round in range(rounds):
+                do_cycle(base, r, pp, mf, FEEDBACK_FUNCS[GEN_class])
+                do_cycle(flipped, r, pp, mf, FEEDBACK_FUNCS[GEN_class])
+                masks[coordinates, round] |= get_flipped_masks(base, flipped)
+
+    perf_pow = get_perf_pow(np.arange(length))
+    return -1 if (perf_pow == -1).any() else int(perf_pow.max())
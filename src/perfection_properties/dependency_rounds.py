@@ -0,0 +1,112 @@
+"""Зависимости выходных координат генератора от входных по раундам.
+
+За одно моделирование на пакете векторов для каждой входной координаты i и раунда t запоминается маска
+masks[i, t] - OR по всем sample разностей состояний пары соседних по i-ой координате векторов после t + 1 тактов,
+размер массива масок (n * r, rounds, n) + get_cell_shape(r). Бит j маски (координата cell * r + b - b-ый бит
+ячейки cell) равен 1, если на этом раунде изменение i-ой координаты изменило j-ую хотя бы для одного sample.
+
+Зависимость, обнаруженная на некотором раунде, на следующих раундах может не проявляться: на каждом такте
+в старшую ячейку записывается новое значение модифицирующего преобразования. Поэтому показатель совершенности
+и локальные показатели вычисляются как первый раунд, на котором все требуемые зависимости выполнены
+на этом же раунде (как get_GEN_class_perfection_power_bulk с retire_saturated=False), а не по раундам
+первого появления зависимостей (get_first_dependency_rounds).
+"""
+from typing import Callable, List, Union
+
+import numpy as np
+
+from src.generators.cells import check_cell_size, get_cell_shape, unpack_cells
+from src.generators.mag import MAG
+from src.generators.mmlr import MMLR
+from src.perfection_properties.bulk_perfection_check import (FEEDBACK_FUNCS, do_cycle, form_flipped_states,
+                                                             get_flipped_masks, is_full_mask)
+from src.perfection_properties.perfection_check import gen_random_samples
+from src.perfection_properties.sampling import SampleSource
+
+
+# значение элемента матрицы первых раундов для не обнаруженной зависимости
+NOT_OBSERVED = 0
+
+
+def get_dependency_dtype(max_rounds: int):
+    """Наименьший беззнаковый тип numpy, вмещающий номера раундов до max_rounds"""
+    for dtype in (np.uint8, np.uint16):
+        if max_rounds <= np.iinfo(dtype).max:
+            return dtype
+    raise Exception('Ошибка: число раундов для матрицы зависимостей не должно превышать 65535')
+
+
+def get_GEN_class_dependency_masks(
+    n: int,
+    r: int,
+    pp: List[int],
+    mf: Callable,
+    samples_num: int,
+    max_rounds: int,
+    GEN_class: Union[MAG, MMLR],
+    samples: List[int] = None,
+    sample_source: SampleSource = None
+) -> np.ndarray:
+    """
+    Возвращает маски зависимостей по раундам размера (n * r, rounds, n) + get_cell_shape(r).
+    Параметры те же, что и у get_GEN_class_perfection_power_bulk. Моделирование прекращается на первом раунде,
+    на котором преобразование совершенно (все локальные показатели к этому раунду определены), или после max_rounds
+    раундов, rounds - число проделанных раундов.
+    """
+    check_cell_size(r)
+    if GEN_class not in FEEDBACK_FUNCS:
+        raise Exception('Ошибка: неизвестный класс генератора')
+
+    length = n * r
+    masks = np.zeros((length, max_rounds, n) + get_cell_shape(r), dtype=np.uint64)
+
+    if samples is None:
+        if sample_source is None:
+            samples = gen_random_samples(length, samples_num)
+        else:
+            samples = sample_source.cells(samples_num, r, n)
+
+    base, flipped = form_flipped_states(samples, r, n)
+    for round in range(max_rounds):
+        do_cycle(base, r, pp, mf, FEEDBACK_FUNCS[GEN_class])
+        do_cycle(flipped, r, pp, mf, FEEDBACK_FUNCS[GEN_class])
+        masks[:, round] = get_flipped_masks(base, flipped)
+        if is_full_mask(masks[:, round], r).all():
+            return masks[:, :round + 1]
+    return masks
+
+
+def get_dependency_bits(masks: np.ndarray, r: int) -> np.ndarray:
+    """Переводит маски в булев массив размера (n * r, rounds, n * r): [i, t, j] - зависимость j-ой выходной
+    координаты от i-ой входной на раунде t + 1"""
+    bits = unpack_cells(masks, r)
+    return bits.reshape(masks.shape[0], masks.shape[1], -1).astype(bool)
+
+
+def get_perfection_power_from_masks(masks: np.ndarray, r: int) -> int:
+    """Показатель совершенности: первый раунд, на котором каждая выходная координата зависит от каждой входной,
+    -1 - если такого раунда нет среди rounds раундов"""
+    perfect = is_full_mask(masks, r).all(axis=0)
+    return int(perfect.argmax()) + 1 if perfect.any() else -1
+
+
+def get_local_perfection_power_from_masks(masks: np.ndarray, r: int, local_start: int, local_end: int) -> int:
+    """Локальный показатель совершенности: первый раунд, на котором выходные координаты [local_start, local_end)
+    зависят от всех входных координат, -1 - если такого раунда нет"""
+    perfect = get_dependency_bits(masks, r)[:, :, local_start: local_end].all(axis=(0, 2))
+    return int(perfect.argmax()) + 1 if perfect.any() else -1
+
+
+def get_coverage(masks: np.ndarray, r: int) -> np.ndarray:
+    """Возвращает массив длины rounds: доля пар координат, зависимость которых выполнена на раунде t + 1"""
+    return get_dependency_bits(masks, r).mean(axis=(0, 2))
+
+
+def get_first_dependency_rounds(masks: np.ndarray, r: int) -> np.ndarray:
+    """Матрица первых раундов появления зависимостей размера (n * r, n * r) типа uint8 (uint16 при rounds > 255):
+    [i, j] - номер (с 1) первого раунда, на котором обнаружена зависимость j-ой выходной координаты от i-ой входной,
+    NOT_OBSERVED - зависимость не обнаружена. Максимум матрицы не является показателем совершенности."""
+    bits = get_dependency_bits(masks, r)
+    observed = bits.any(axis=1)
+    first_rounds = np.where(observed, bits.argmax(axis=1) + 1, NOT_OBSERVED)
+    return first_rounds.astype(get_dependency_dtype(masks.shape[1]))
@@ -2,6 +2,7 @@ from random import randint
 from typing import Generator, List, Callable, Tuple, Union
 from src.generators.mmlr import MMLR
 from src.generators.mag import MAG
+from src.perfection_properties.sampling import SampleSource
 
 
 def gen_random_samples(n: int, num: int) -> List[int]:
@@ -73,6 +74,33 @@ def get_GEN_class_generators(
     return gens_ret
 
 
+def get_GEN_class_flipped_generators(
+    n: int,
+    r: int,
+    pp: List[int],
+    mf: Callable,
+    samples: List[int],
+    GEN_class: Union[MAG, MMLR]
+) -> Tuple[List[Generator], List[List[Generator]]]:
+    """Формирование len(samples) базовых генераторов, заведенных на samples, и len(samples)*n*r генераторов,
+    заведенных на векторы, отличающиеся от samples в одной координате.
+    Пара (sample, sample ^ (1 << i)) совпадает с парой get_neighbor_numbers(sample, i) с точностью до порядка,
+    поэтому разности состояний те же, что и для генераторов get_GEN_class_generators, а моделируется
+    len(samples)*(n*r + 1) генераторов вместо len(samples)*2*n*r.
+    Возвращаемые генераторы сгруппированны следующим образом:
+        base[для такого-то sample]
+        flipped[соседний по i-ой координате][для такого-то sample]
+    """
+    length = n*r
+
+    base = [GEN_class(r, n, pp, mf, sample) for sample in samples]
+    flipped = [
+        [GEN_class(r, n, pp, mf, sample ^ (1 << i)) for sample in samples]
+        for i in range(length)
+    ]
+    return base, flipped
+
+
 def get_next_gens_states(
     n: int, 
     samples_num: int, 
@@ -136,6 +164,41 @@ def check_current_round(
     return True
 
 
+def step_coordinate_pairs(pairs: List[Tuple[Generator]]) -> Tuple[int, List[Tuple[Generator]]]:
+    """
+    Производит такт работы генераторов пар, соседних по одной координате, и возвращает OR разностей их состояний
+    и список пар, которые нужно продолжать моделировать: пара с совпавшими состояниями в дальнейшем
+    дает нулевую разность, поэтому исключается.
+    """
+    resulted_vect = 0
+    active_pairs = []
+    for first_gen, second_gen in pairs:
+        diff = next(first_gen)[1] ^ next(second_gen)[1]
+        if diff:
+            resulted_vect |= diff
+            active_pairs.append((first_gen, second_gen))
+    return resulted_vect, active_pairs
+
+
+def step_coordinate_flipped(
+    base_states: List[int],
+    flipped: List[Tuple[int, Generator]]
+) -> Tuple[int, List[Tuple[int, Generator]]]:
+    """
+    То же, что и step_coordinate_pairs, для генераторов, отличающихся от базовых в одной координате:
+    flipped - список пар (номер sample, генератор), разности берутся с состояниями базовых генераторов base_states,
+    уже переведенных в следующий такт.
+    """
+    resulted_vect = 0
+    active_flipped = []
+    for sample_num, gen in flipped:
+        diff = next(gen)[1] ^ base_states[sample_num]
+        if diff:
+            resulted_vect |= diff
+            active_flipped.append((sample_num, gen))
+    return resulted_vect, active_flipped
+
+
 def get_GEN_class_perfection_power(
     n: int,
     r: int,
@@ -143,7 +206,10 @@ def get_GEN_class_perfection_power(
     mf: Callable[[int], int],
     samples_num: int,
     max_rounds: int,
-    GEN_class: Union[MAG, MMLR]
+    GEN_class: Union[MAG, MMLR],
+    retire_saturated: bool = False,
+    sample_source: SampleSource = None,
+    shared_baseline: bool = False
 ) -> int:
     """
     Определяет показатель совершенности для переданного алгоритма.
@@ -154,11 +220,29 @@ def get_GEN_class_perfection_power(
         mf: 
         samples_num: количество пар соседних векторов, на которых будет происходить проверка
         max_rounds: максимальная число раундов зашифрования, до которой стоит пытаться определить показатель
+        retire_saturated: исключать из моделирования входную координату, как только изменение этой координаты
+            изменило все выходные координаты. Предполагается, что существенная зависимость выходных координат
+            от входной, обнаруженная на некотором раунде, сохраняется на последующих раундах (как зависимости
+            в степенях перемешивающей матрицы без нулевых строк). Предположение может не выполняться: на каждом такте
+            в старшую ячейку записывается новое значение модифицирующего преобразования, и OR разностей по sample
+            на следующем раунде может не состоять из единиц, поэтому показатель с исключением координат может быть
+            меньше. По умолчанию (retire_saturated=False) совершенность проверяется заново на каждом раунде
+            для всех координат. Пары с совпавшими состояниями исключаются в обоих режимах (step_coordinate_pairs).
+        sample_source: источник векторов с известным seed, по умолчанию - gen_random_samples
+        shared_baseline: моделировать для каждого sample один базовый генератор и n*r генераторов с измененной
+            координатой (get_GEN_class_flipped_generators) вместо 2*n*r генераторов пар соседних векторов,
+            маски зависимостей при этом те же
     """
     length = n * r
 
     # сформируем samples_num случайных чисел для формирования из них пар соседних векторов
-    samples = gen_random_samples(length, samples_num)
+    if sample_source is None:
+        samples = gen_random_samples(length, samples_num)
+    else:
+        samples = sample_source.samples(samples_num)
+
+    if shared_baseline:
+        return get_GEN_class_perfection_power_shared(n, r, pp, mf, samples, max_rounds, GEN_class, retire_saturated)
 
     # сформируем всевозможные необходимые генераторы в количестве n*samples_num*2
     gens = get_GEN_class_generators(
@@ -170,10 +254,64 @@ def get_GEN_class_perfection_power(
         GEN_class
     )
 
+    # результирующий проверочный вектор должен состоять только из единиц
+    resulted_vect = 2**length - 1
+
+    # active[i] - пары генераторов, соседних по i-ой координате, которые еще нужно моделировать
+    active = dict(enumerate(gens))
+
     for round in range(max_rounds):
+        perfect = True
+        for i in list(active):
+            i_resulted_vect, active[i] = step_coordinate_pairs(active[i])
+            if i_resulted_vect == resulted_vect:
+                if retire_saturated:
+                    del active[i]
+            else:
+                perfect = False
+
+        if perfect:
+            return round + 1
+    return -1
+
+
+def get_GEN_class_perfection_power_shared(
+    n: int,
+    r: int,
+    pp: List[int],
+    mf: Callable[[int], int],
+    samples: List[int],
+    max_rounds: int,
+    GEN_class: Union[MAG, MMLR],
+    retire_saturated: bool = False
+) -> int:
+    """
+    То же, что и get_GEN_class_perfection_power, с общими для всех координат базовыми генераторами:
+    на каждом такте базовые генераторы переводятся в следующее состояние один раз, и состояние каждого генератора
+    с измененной координатой сравнивается с состоянием базового генератора того же sample.
+    """
+    length = n * r
+
+    base, flipped = get_GEN_class_flipped_generators(n, r, pp, mf, samples, GEN_class)
 
-        round_states = get_next_gens_states(length, samples_num, gens)
+    # результирующий проверочный вектор должен состоять только из единиц
+    resulted_vect = 2**length - 1
 
-        if check_current_round(length, samples_num, round_states):
+    # active[i] - генераторы с измененной i-ой координатой, которые еще нужно моделировать
+    active = {i: list(enumerate(gens)) for i, gens in enumerate(flipped)}
+
+    for round in range(max_rounds):
+        base_states = [next(gen)[1] for gen in base]
+
+        perfect = True
+        for i in list(active):
+            i_resulted_vect, active[i] = step_coordinate_flipped(base_states, active[i])
+            if i_resulted_vect == resulted_vect:
+                if retire_saturated:
+                    del active[i]
+            else:
+                perfect = False
+
+        if perfect:
             return round + 1
-    return -1
\ No newline at end of file
+    return -1
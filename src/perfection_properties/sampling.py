@@ -0,0 +1,98 @@
+"""Воспроизводимое формирование векторов для оценки показателя совершенности.
+
+Векторы длины length бит формируются генератором numpy.random.Generator с известным начальным значением (seed)
+сразу пакетом и хранятся упакованными в массив uint64 размера (num, ceil(length / 64)),
+бит i вектора - бит i % 64 слова i // 64. Повторный запуск с тем же seed и стратегией дает те же векторы,
+поэтому seed указывается вместе с результатами экспериментов.
+
+Стратегии формирования векторов:
+    uniform:    равномерно распределенные векторы;
+    low_weight: векторы веса weight (по умолчанию length / 16) со случайным расположением единиц;
+    balanced:   в каждой координате ровно половина векторов пакета содержит единицу (с точностью до одного).
+                Балансируется только каждая координата в отдельности: координаты независимо перемешиваются,
+                совместные значения пар и наборов координат не балансируются, и это не схема
+                с низкой неравномерностью (low-discrepancy).
+"""
+from typing import List
+
+import numpy as np
+
+from src.generators.cells import check_cell_size, pack_cells
+
+
+# допустимые стратегии формирования векторов
+STRATEGIES = ('uniform', 'low_weight', 'balanced')
+
+
+class SampleSource:
+    """
+    Источник векторов для формирования пар соседних векторов.
+
+    Атрибуты экземпляров:
+        length: int         длина векторов в битах
+        strategy: str       стратегия формирования векторов
+        seed: int           начальное значение генератора
+        weight: int         вес векторов для стратегии low_weight
+    """
+
+    def __init__(self, length: int, strategy: str = 'uniform', seed: int = None, weight: int = None):
+        if strategy not in STRATEGIES:
+            raise Exception(f'Ошибка: неизвестная стратегия формирования векторов, допустимые: {", ".join(STRATEGIES)}')
+        if seed is None:
+            seed = int(np.random.SeedSequence().entropy)
+        if weight is None:
+            weight = max(1, length // 16)
+        if not 0 <= weight <= length:
+            raise Exception('Ошибка: вес векторов должен лежать в промежутке [0, length]')
+        self.length = length
+        self.strategy = strategy
+        self.seed = seed
+        self.weight = weight
+        self._rng = np.random.default_rng(seed)
+
+    def __repr__(self):
+        return f'SampleSource(length={self.length}, strategy={self.strategy!r}, seed={self.seed})'
+
+    def _pack_bits(self, bits: np.ndarray) -> np.ndarray:
+        """Упаковывает массив бит размера (num, length) в массив uint64 размера (num, words)"""
+        words = -(-self.length // 64)
+        padded = np.zeros((bits.shape[0], words * 64), dtype=np.uint8)
+        padded[:, :self.length] = bits
+        return np.packbits(padded, axis=1, bitorder='little').view('<u8').astype(np.uint64)
+
+    def packed(self, num: int) -> np.ndarray:
+        """Возвращает num векторов, упакованных в массив uint64 размера (num, ceil(length / 64))"""
+        if self.strategy == 'uniform':
+            words = -(-self.length // 64)
+            packed = self._rng.integers(0, np.iinfo(np.uint64).max, (num, words), dtype=np.uint64, endpoint=True)
+            if self.length % 64:
+                packed[:, -1] &= np.uint64((1 << (self.length % 64)) - 1)
+            return packed
+
+        if self.strategy == 'low_weight':
+            # единицы в позициях weight наименьших случайных ключей
+            keys = self._rng.random((num, self.length))
+            ones = np.argpartition(keys, self.weight - 1, axis=1)[:, :self.weight] if self.weight else []
+            bits = np.zeros((num, self.length), dtype=np.uint8)
+            np.put_along_axis(bits, np.asarray(ones, dtype=np.int64).reshape(num, -1), 1, axis=1)
+            return self._pack_bits(bits)
+
+        # balanced: независимые случайные перестановки сбалансированного столбца для каждой координаты
+        column = (np.arange(num) < (num + self._rng.integers(0, 2)) // 2).astype(np.uint8)
+        bits = self._rng.permuted(np.repeat(column[:, None], self.length, axis=1), axis=0)
+        return self._pack_bits(bits)
+
+    def samples(self, num: int) -> List[int]:
+        """Возвращает num векторов в виде чисел (как gen_random_samples)"""
+        return [int.from_bytes(row.astype('<u8').tobytes(), 'little') for row in self.packed(num)]
+
+    def cells(self, num: int, r: int, n: int) -> np.ndarray:
+        """Возвращает num векторов длины n * r = length, разбитых на n ячеек по r бит,
+        в виде массива uint64 размера (num, n) + get_cell_shape(r) (см. src.generators.cells);
+        ячейка 0 - младшие r бит вектора"""
+        if n * r != self.length:
+            raise Exception('Ошибка: длина векторов не равна n * r')
+        check_cell_size(r)
+        packed = self.packed(num)
+        bits = np.unpackbits(packed.astype('<u8').view(np.uint8), axis=1, bitorder='little')[:, :self.length]
+        return pack_cells(bits.reshape(num, n, r), r)
@@ -0,0 +1,79 @@
+"""Оценка показателя совершенности генераторов по перемешивающей матрице.
+
+Если после t тактов выходной бит j существенно зависит от входного бита i, то элемент (i, j) степени M^t
+перемешивающей матрицы генератора равен 1: перемешивающая матрица описывает все возможные зависимости.
+Поэтому совершенность на такте t влечет полноту M^t, и экспонент перемешивающей матрицы - нижняя граница
+показателя совершенности, часто совпадающая с ним. Экспонент блочной перемешивающей матрицы вычисляется
+без моделирования генератора, а моделирование на случайных векторах нужно только для проверки оценки.
+"""
+from typing import List, Tuple, Union
+
+import numpy as np
+
+from src.generators.mag import MAG
+from src.generators.mmlr import MMLR
+from src.mixing_matrixes.matrixes_generation import construct_block_matrix_MAG, construct_block_matrix_MMLR
+from src.mixing_matrixes.mixing_properties import get_exponent
+from src.perfection_properties.bulk_perfection_check import get_GEN_class_perfection_power_bulk
+from src.perfection_properties.sampling import SampleSource
+
+
+# функции построения блочной перемешивающей матрицы для классов генераторов
+BLOCK_MATRIX_CONSTRUCTORS = {
+    MMLR: construct_block_matrix_MMLR,
+    MAG: construct_block_matrix_MAG,
+}
+
+
+def get_structural_perfection_power(
+    n: int,
+    r: int,
+    pp: List[int],
+    mf_matrix: np.ndarray,
+    max_rounds: int,
+    GEN_class: Union[MAG, MMLR]
+) -> int:
+    """
+    Возвращает экспонент перемешивающей матрицы генератора - нижнюю границу показателя совершенности,
+    если экспонент превосходит max_rounds или не существует, вернет -1.
+    Параметры:
+        mf_matrix:  перемешивающая матрица модифицирующего преобразования размера r x r
+                    (например, construct_mixing_matrix_pow_SPECK(1, 32) для одно-раундового SPECK32)
+    """
+    if GEN_class not in BLOCK_MATRIX_CONSTRUCTORS:
+        raise Exception('Ошибка: неизвестный класс генератора')
+    return get_exponent(BLOCK_MATRIX_CONSTRUCTORS[GEN_class](r, n, pp, mf_matrix), max_rounds)
+
+
+def get_GEN_class_perfection_power_structural(
+    n: int,
+    r: int,
+    pp: List[int],
+    mf,
+    mf_matrix: np.ndarray,
+    max_rounds: int,
+    GEN_class: Union[MAG, MMLR],
+    verify_samples: int = 0,
+    sample_source: SampleSource = None
+) -> Tuple[int, bool]:
+    """
+    Определяет показатель совершенности генератора по экспоненту его перемешивающей матрицы.
+
+    Если экспонент превосходит max_rounds, то и показатель совершенности превосходит max_rounds,
+    и моделирование не требуется: возвращается (-1, True).
+    При verify_samples = 0 возвращается экспонент без проверки: (экспонент, False).
+    Иначе показатель совершенности вычисляется моделированием на verify_samples парах соседних векторов
+    (get_GEN_class_perfection_power_bulk) и возвращается вместе с признаком совпадения с экспонентом.
+
+    mf - модифицирующее преобразование, применяемое поэлементно к массиву numpy (нужно только для проверки),
+    mf_matrix - его перемешивающая матрица.
+    """
+    exponent = get_structural_perfection_power(n, r, pp, mf_matrix, max_rounds, GEN_class)
+    if exponent == -1:
+        return -1, True
+    if not verify_samples:
+        return exponent, False
+
+    perf_pow = get_GEN_class_perfection_power_bulk(
+        n, r, pp, mf, verify_samples, max_rounds, GEN_class, sample_source=sample_source)
+    return perf_pow, perf_pow == exponent
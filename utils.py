@@ -195,7 +195,12 @@ def get_api_method_args(pkg_api: ImportedPkgAPI, class_api: APIClass, method_nam
         param = cast(Parameter, sig.parameters[param_name])
         param_type = param.annotation
         arg_in = input(f"Введите {param.name}: ")
-        arg = cast_api_method_arg_str_to_type(arg_in, param_type)
+
+        # пустой ввод для параметра со значением по умолчанию - значение по умолчанию
+        if arg_in == '' and param.default != Parameter.empty:
+            arg = param.default
+        else:
+            arg = cast_api_method_arg_str_to_type(arg_in, param_type)
 
         # если аргумент называется filename,
         # то приписваем путь для сохранения результатов эксперимента к названию файла
@@ -0,0 +1,117 @@
+"""Журнал контрольных точек для длительных переборов наборов точек съема.
+
+Результат для каждого набора точек съема сразу дописывается в конец журнала отдельной строкой в формате JSON
+и сбрасывается на диск, поэтому при аварийном завершении теряется не более одной записи.
+Запись идентифицируется названием эксперимента, его параметрами (r, n, степень SPECK, ...) и набором точек съема,
+так что один журнал может содержать результаты разных экспериментов. При запуске эксперимента без возобновления
+его прежние записи удаляются из журнала, записи других экспериментов сохраняются.
+"""
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class Checkpoint:
+    """
+    Журнал результатов перебора, новые записи дописываются в конец журнала.
+
+    Атрибуты экземпляров:
+        file_name: str                      путь к файлу журнала
+        experiment: str                     название эксперимента
+        params: Dict[str, Any]              параметры эксперимента
+        done: Dict[Tuple[int, ...], int]    результаты из журнала для данного эксперимента
+    """
+
+    def __init__(self, file_name: str, experiment: str, params: Dict[str, Any], resume: bool = False):
+        """
+        file_name: путь к файлу журнала
+
+        experiment: название эксперимента
+
+        params: параметры эксперимента, должны быть сериализуемы в JSON
+
+        resume: загрузить ранее полученные результаты эксперимента из журнала, иначе они удаляются из журнала
+        """
+        self.file_name = file_name
+        self.experiment = experiment
+        self.params = json.loads(json.dumps(params, sort_keys=True))
+        self.done = {}
+
+        os.makedirs(os.path.dirname(file_name) or '.', exist_ok=True)
+        if os.path.exists(file_name):
+            self.terminate_last_line()
+            if resume:
+                self.load()
+            else:
+                self.discard()
+
+    def terminate_last_line(self) -> None:
+        """Завершает переводом строки недописанную при аварийном завершении последнюю запись,
+        чтобы она не слилась со следующей"""
+        with open(self.file_name, 'rb+') as file:
+            file.seek(0, os.SEEK_END)
+            if file.tell() == 0:
+                return
+            file.seek(-1, os.SEEK_END)
+            if file.read(1) != b'\n':
+                file.write(b'\n')
+
+    def load(self) -> None:
+        """Загрузка результатов данного эксперимента из журнала"""
+        with open(self.file_name, 'r') as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # недописанная при аварийном завершении строка
+                    continue
+                if self.is_own_record(record):
+                    self.done[tuple(record['pp'])] = record['value']
+
+    def is_own_record(self, record: Dict[str, Any]) -> bool:
+        """Проверка того, что запись журнала относится к данному эксперименту"""
+        return record.get('experiment') == self.experiment and record.get('params') == self.params
+
+    def discard(self) -> None:
+        """Удаление из журнала записей данного эксперимента, чтобы повторный запуск не дублировал их"""
+        with open(self.file_name, 'r') as file:
+            lines = file.readlines()
+
+        kept = []
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # недописанная при аварийном завершении строка
+                continue
+            if not self.is_own_record(record):
+                kept.append(line)
+        if len(kept) == len(lines):
+            return
+
+        # запись во временный файл и переименование, чтобы при аварийном завершении журнал не был потерян
+        tmp_name = f'{self.file_name}.{os.getpid()}.tmp'
+        with open(tmp_name, 'w') as file:
+            file.writelines(kept)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_name, self.file_name)
+
+    def get(self, pickup_points: List[int]) -> Optional[int]:
+        """Возвращает сохраненный результат для набора точек съема или None"""
+        return self.done.get(tuple(pickup_points))
+
+    def record(self, pickup_points: List[int], value: int) -> None:
+        """Дописывает результат для набора точек съема в журнал и сбрасывает его на диск"""
+        line = json.dumps({
+            'experiment': self.experiment,
+            'params': self.params,
+            'ppnum': len(pickup_points),
+            'pp': list(pickup_points),
+            'value': value
+        })
+        with open(self.file_name, 'a') as file:
+            file.write(line + '\n')
+            file.flush()
+            os.fsync(file.fileno())
+        self.done[tuple(pickup_points)] = value
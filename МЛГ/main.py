@@ -1,18 +1,61 @@
-import operator
-
 from algo.speck import one_round_SPECK_32
 from mixing_matrixes import (construct_mixing_matrix_MMLR,
                              construct_mixing_matrix_SPECK,
                              construct_mixing_matrix_pow_SPECK)
 from mixing_props import get_exponent, get_local_exponent
 from perfection_props import get_MMLR_perfection_power
-from utils import comb, write_exponents, write_matrix, write_perf_index, progress_info
+from pruning import mmlr_exponent_pruning, mmlr_local_exponent_pruning
+from sweep import run_sweep
+from utils import write_exponents, write_matrix, write_perf_index
+
+
+def exponent_MMLR_SPECK(pickup_points, r: int, n: int, max_rounds: int, pow: int) -> int:
+    """Экспонент ММЛГ с точками съема pickup_points и модифицирующей функцией pow-раундовый SPECK"""
+
+    # формирование перемешивающей матрицы МЛГ, с учетом перемешивающей матрицы для модифицируюшего преобразования SPECK
+    mix_matr = construct_mixing_matrix_MMLR(
+        r,
+        n,
+        pickup_points,
+        construct_mixing_matrix_pow_SPECK(pow, r))
+
+    # нахождение экспоненты рассматриваемой перемешивающей матрицы МЛГ
+    return get_exponent(mix_matr, max_rounds)
+
+
+def local_exponent_MMLR_SPECK(pickup_points, r: int, n: int, max_rounds: int, cell: int) -> int:
+    """Локальный экспонент ячейки cell ММЛГ с точками съема pickup_points и модифицирующей функцией SPECK"""
+    local_start = r * cell
+    local_end = local_start + r
 
+    # формирование перемешивающей матрицы МЛГ, с учетом перемешивающей матрицы для модифицируюшего преобразования SPECK
+    mix_matr = construct_mixing_matrix_MMLR(
+        r,
+        n,
+        pickup_points,
+        construct_mixing_matrix_SPECK(r))
 
-from multiprocessing import Process
+    # нахождение экспоненты рассматриваемой перемешивающей матрицы МЛГ
+    return get_local_exponent(mix_matr, max_rounds, local_start, local_end)
 
 
-def research_mixing_props_MMLR_SPECK(r: int, n: int, ppnum_min: int, ppnum_max: int, max_rounds: int, pow: int):
+def perf_index_MMLR_SPECK(pickup_points, r: int, n: int, samples_num: int, max_rounds: int) -> int:
+    """Показатель совершенности ММЛГ с точками съема pickup_points и модифицирующей функцией однораундовый SPECK"""
+    return get_MMLR_perfection_power(n, r, pickup_points, one_round_SPECK_32, samples_num, max_rounds)
+
+
+def research_mixing_props_MMLR_SPECK(
+    r: int,
+    n: int,
+    ppnum_min: int,
+    ppnum_max: int,
+    max_rounds: int,
+    pow: int,
+    processes: int = None,
+    resume: bool = False,
+    best_only: bool = False,
+    checkpoint_dir: str = "./checkpoints"
+):
     """
     Изучает перемешивающие свойства ММЛГ с модифицирующей функцией SPECK.
     Перебирает различные ММЛГ варьируя числом точек съема и их расположением.
@@ -28,92 +71,61 @@ def research_mixing_props_MMLR_SPECK(r: int, n: int, ppnum_min: int, ppnum_max:
     max_rounds: максимальная степень, до которой перемешивающая матрица генератора с определенным набором точек съема будет возводиться
     
     pow: степень матрицы SPECK
+
+    processes: количество процессов, между которыми распределяется перебор (по умолчанию - количество ядер)
+
+    resume: продолжить прерванный перебор, пропуская наборы точек съема из журнала контрольных точек
+
+    best_only: записывать только наборы точек съема с наименьшим экспонентом, пропуская наборы,
+    экспонент которых заведомо больше найденного
+
+    checkpoint_dir: каталог журналов контрольных точек, None - журнал не ведется
     """
+    suffix = "_best" if best_only else ""
+    run_sweep(
+        exponent_MMLR_SPECK,
+        dict(r=r, n=n, max_rounds=max_rounds, pow=pow),
+        n,
+        ppnum_min,
+        ppnum_max,
+        write_exponents,
+        lambda ppnum: f"./exponents/MMLR_SPECK_pow_{pow}/r_{r}_n_{n}_ppnum_{ppnum}{suffix}.txt",
+        processes,
+        checkpoint=(f"{checkpoint_dir}/exponents/MMLR_SPECK_pow_{pow}/r_{r}_n_{n}.log"
+                    if checkpoint_dir else None),
+        resume=resume,
+        pruning=mmlr_exponent_pruning(n),
+        best_only=best_only
+    )
 
-    # перебор различного количества точек съема
-    # ppnum_min - 1, ppnum_max - т.к. 0 точка съема всегда присутсвует
-    for ppnum in range(ppnum_min - 1, ppnum_max):
-
-        # results: [(ppnum, pp, power)]
-        results = list()
-
-        # перебор различный расстановок точек съема для заданного количества точек съема
-        # n-1 - т.к. 0 точка съема всегда присутсвует
-        for pp in comb(n - 1, ppnum):
-            pickup_points = [0] + pp
-
-            # формирование перемешивающей матрицы МЛГ, с учетом перемешивающей матрицы для модифицируюшего преобразования SPECK
-            mix_matr = construct_mixing_matrix_MMLR(
-                r,
-                n,
-                pickup_points,
-                construct_mixing_matrix_pow_SPECK(pow, r))
-                # construct_mixing_matrix_SPECK(r))
-
-            # нахождение экспоненты рассматриваемой перемешивающей матрицы МЛГ
-            power = get_exponent(mix_matr, max_rounds)
-
-            # если экспонент найден, сохраняем информацию о данном варианте МЛГ
-            # также сохраняем перемешивающую матрицу для данного МЛГ с точками съема pickup_points
-            if power != -1:
-                results.append((ppnum + 1, pickup_points, power))
-                # write_matrix(
-                #     f"./matrixes/MMLR_SPECK/ppnum_{ppnum}_pp_{pickup_points}.txt",
-                #     mix_matr
-                # )
-
-        # сотрируем результаты для МЛГ с задданым ppnum числом точек съема со всеми воможными расположениями точек съема по значению экспонента (от меньшего к большему)
-        results = list(sorted(results, key=operator.itemgetter(2)))
-
-        write_exponents(
-            f"./exponents/MMLR_SPECK_pow_{pow}/r_{r}_n_{n}_ppnum_{ppnum + 1}.txt",
-            results
-        )
-
-        progress_info(f"ppnum={ppnum + 1} done")
-
-def research_local_mixing_props_MMLR_SPECK(r: int, n: int, ppnum_min: int, ppnum_max: int, max_rounds: int, cell: int):
-    local_start = r * cell
-    local_end = local_start + r
-    # перебор различного количества точек съема
-    # ppnum_min - 1, ppnum_max - т.к. 0 точка съема всегда присутсвует
-    for ppnum in range(ppnum_min - 1, ppnum_max):
-
-        # results: [(ppnum, pp, power)]
-        results = list()
-
-        # перебор различный расстановок точек съема для заданного количества точек съема
-        # n-1 - т.к. 0 точка съема всегда присутсвует
-        for pp in comb(n - 1, ppnum):
-            pickup_points = [0] + pp
-
-            # формирование перемешивающей матрицы МЛГ, с учетом перемешивающей матрицы для модифицируюшего преобразования SPECK
-            mix_matr = construct_mixing_matrix_MMLR(
-                r,
-                n,
-                pickup_points,
-                construct_mixing_matrix_SPECK(r))
-
-            # нахождение экспоненты рассматриваемой перемешивающей матрицы МЛГ
-            power = get_local_exponent(mix_matr, max_rounds, local_start, local_end)
-
-            # если экспонент найден, сохраняем информацию о данном варианте МЛГ
-            # также сохраняем перемешивающую матрицу для данного МЛГ с точками съема pickup_points
-            if power != -1:
-                results.append((ppnum + 1, pickup_points, power))
-                # write_matrix(
-                #     f"./matrixes/MMLR_SPECK/ppnum_{ppnum}_pp_{pickup_points}.txt",
-                #     mix_matr
-                # )
-
-        # сотрируем результаты для МЛГ с задданым ppnum числом точек съема со всеми воможными расположениями точек съема по значению экспонента (от меньшего к большему)
-        results = list(sorted(results, key=operator.itemgetter(2)))
-
-        write_exponents(
-            f"./local_exponents/MMLR_SPECK_cell_{cell}/r_{r}_n_{n}_ppnum_{ppnum + 1}.txt",
-            results
-        )
-        progress_info(f"ppnum={ppnum + 1} done")
+def research_local_mixing_props_MMLR_SPECK(
+    r: int,
+    n: int,
+    ppnum_min: int,
+    ppnum_max: int,
+    max_rounds: int,
+    cell: int,
+    processes: int = None,
+    resume: bool = False,
+    best_only: bool = False,
+    checkpoint_dir: str = "./checkpoints"
+):
+    suffix = "_best" if best_only else ""
+    run_sweep(
+        local_exponent_MMLR_SPECK,
+        dict(r=r, n=n, max_rounds=max_rounds, cell=cell),
+        n,
+        ppnum_min,
+        ppnum_max,
+        write_exponents,
+        lambda ppnum: f"./local_exponents/MMLR_SPECK_cell_{cell}/r_{r}_n_{n}_ppnum_{ppnum}{suffix}.txt",
+        processes,
+        checkpoint=(f"{checkpoint_dir}/local_exponents/MMLR_SPECK_cell_{cell}/r_{r}_n_{n}.log"
+                    if checkpoint_dir else None),
+        resume=resume,
+        pruning=mmlr_local_exponent_pruning(n, cell),
+        best_only=best_only
+    )
 
 def research_perfection_props_MMLR_SPECK(
     n: int,
@@ -121,38 +133,30 @@ def research_perfection_props_MMLR_SPECK(
     ppnum_min: int, 
     ppnum_max: int,
     samples_num: int,
-    max_rounds: int
+    max_rounds: int,
+    processes: int = None,
+    resume: bool = False,
+    checkpoint_dir: str = "./checkpoints"
 ):
-
-    # перебор различного количества точек съема
-    # ppnum_min - 1, ppnum_max - т.к. 0 точка съема всегда присутсвует
-    for ppnum in range(ppnum_min - 1, ppnum_max):
-
-        # results: [(ppnum, pp, perf_index)]
-        results = list()
-
-        # перебор различный расстановок точек съема для заданного количества точек съема
-        # n-1 - т.к. 0 точка съема всегда присутсвует
-        for pp in comb(n - 1, ppnum):
-            pickup_points = [0] + pp
-
-            perf_index = get_MMLR_perfection_power(n, r, pickup_points, one_round_SPECK_32, samples_num, max_rounds)
-            if perf_index != -1:
-                results.append((ppnum + 1, pickup_points, perf_index))
-        
-        # сотрируем результаты для МЛГ с задданым ppnum числом точек съема со всеми воможными расположениями точек съема по значению экспонента (от меньшего к большему)
-        results = list(sorted(results, key=operator.itemgetter(2)))
-
-        write_perf_index(
-            f"./perf_index/MMLR_SPECK_samples_num_{samples_num}/r_{r}_n_{n}_ppnum_{ppnum + 1}.txt",
-            results
-        )
-        progress_info(f"ppnum={ppnum + 1} done")
+    run_sweep(
+        perf_index_MMLR_SPECK,
+        dict(r=r, n=n, samples_num=samples_num, max_rounds=max_rounds),
+        n,
+        ppnum_min,
+        ppnum_max,
+        write_perf_index,
+        lambda ppnum: f"./perf_index/MMLR_SPECK_samples_num_{samples_num}/r_{r}_n_{n}_ppnum_{ppnum}.txt",
+        processes,
+        checkpoint=(f"{checkpoint_dir}/perf_index/MMLR_SPECK_samples_num_{samples_num}/r_{r}_n_{n}.log"
+                    if checkpoint_dir else None),
+        resume=resume
+    )
 
 
 if __name__ == '__main__':
 
-    p1_args_set = dict(
+    # каждый перебор распределяется между всеми ядрами
+    research_mixing_props_MMLR_SPECK(
         r=32,
         n=8,
         ppnum_min=2,
@@ -160,9 +164,7 @@ if __name__ == '__main__':
         max_rounds=25,
         pow=1
     )
-    p1 = Process(target=research_mixing_props_MMLR_SPECK, kwargs=p1_args_set)
-
-    p2_args_set = dict(
+    research_local_mixing_props_MMLR_SPECK(
         r=32,
         n=8,
         ppnum_min=2,
@@ -170,9 +172,7 @@ if __name__ == '__main__':
         max_rounds=25,
         cell=0
     )
-    p2 = Process(target=research_local_mixing_props_MMLR_SPECK, kwargs=p2_args_set)
-
-    p3_args_set = dict(
+    research_perfection_props_MMLR_SPECK(
         r=32,
         n=8,
         ppnum_min=2,
@@ -180,9 +180,7 @@ if __name__ == '__main__':
         samples_num=100,
         max_rounds=25
     )
-    p3 = Process(target=research_perfection_props_MMLR_SPECK, kwargs=p3_args_set)
-
-    p4_args_set = dict(
+    research_mixing_props_MMLR_SPECK(
         r=32,
         n=8,
         ppnum_min=2,
@@ -190,47 +188,3 @@ if __name__ == '__main__':
         max_rounds=25,
         pow=2
     )
-    p4 = Process(target=research_mixing_props_MMLR_SPECK, kwargs=p4_args_set)
-
-    p1.start()
-    p2.start()
-    p3.start()
-    p4.start()
-
-    p1.join()
-    p2.join()
-    p3.join()
-    p4.join()
-
-    # research_mixing_props_MMLR_SPECK(
-    #     r=32,
-    #     n=8,
-    #     ppnum_min=2,
-    #     ppnum_max=8,
-    #     max_rounds=25,
-    #     pow=1
-    # )
-    # research_local_mixing_props_MMLR_SPECK(
-    #     r=32,
-    #     n=8,
-    #     ppnum_min=2,
-    #     ppnum_max=8,
-    #     max_rounds=25,
-    #     cell=0
-    # )
-    # research_perfection_props_MMLR_SPECK(
-    #     r=32,
-    #     n=8,
-    #     ppnum_min=2,
-    #     ppnum_max=8,
-    #     samples_num=100,
-    #     max_rounds=25
-    # )
-    # research_mixing_props_MMLR_SPECK(
-    #     r=32,
-    #     n=8,
-    #     ppnum_min=2,
-    #     ppnum_max=8,
-    #     max_rounds=25,
-    #     pow=2
-    # )
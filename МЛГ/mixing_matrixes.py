@@ -9,17 +9,17 @@
 (n-1,n-1)  . . .   (n-1,0)
 """
 
+import os
+import sys
+
 import numpy as np
 from typing import List
 
-from utils import cast_matrix_to_identity_format
+# кэш степеней матриц общий с пакетом src/mixing_matrixes, поэтому корень репозитория добавляется в пути поиска модулей
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-def change_column_order(matr: np.ndarray) -> np.ndarray:
-    shape = matr.shape
-    ret_matr = np.ndarray(shape, dtype=np.int)
-    for i in range(shape[1]):
-        ret_matr[0: shape[0], i: i + 1] = matr[0: shape[0], shape[1] - i - 1: shape[1] - i]
-    return ret_matr
+from src.mixing_matrixes.matrix_cache import matrix_cache
+from utils import cast_matrix_to_identity_format, change_column_order
 
 def construct_mixing_matrix_MMLR(r: int, n: int, pp: List[int], mf_mix_matr: np.ndarray) -> np.ndarray:
     """Строит перемешивающую матрицу модифицированного многомерного линейного генератора."""
@@ -139,13 +139,13 @@ def construct_mixing_matrix_SPECK(size: int):
     top_left = triangular
 
     top_right = left_betta_shift + triangular
-    cast_matrix_to_identity_format(top_right)
+    cast_matrix_to_identity_format(top_right, inplace=True)
 
     right_alpha_shift = np.zeros((half_size, half_size), dtype=np.int)
     for i in range(half_size):
         right_alpha_shift[i, (-(i + 1) + alpha + half_size) % half_size] = 1
 
-    bottom_left = bottom_right = change_column_order(change_column_order(right_alpha_shift) @ change_column_order(triangular))
+    bottom_left = bottom_right = change_column_order(change_column_order(right_alpha_shift) @ change_column_order(triangular), inplace=True)
 
     res_matr = np.zeros((half_size*2, half_size*2), dtype=np.int)
 
@@ -154,7 +154,7 @@ def construct_mixing_matrix_SPECK(size: int):
     res_matr[half_size: size, 0: half_size] = bottom_left
     res_matr[half_size: size, half_size: size] = bottom_right
 
-    return change_column_order(res_matr)
+    return change_column_order(res_matr, inplace=True)
 
 # def construct_mixing_matrix_SPECK(size: int):
 #     """Строит перемешивающую матрицу для SPECK
@@ -183,7 +183,7 @@ def construct_mixing_matrix_SPECK(size: int):
 #     top_left = mix_matr2
 
 #     top_right = mix_matr1 + mix_matr2
-#     cast_matrix_to_identity_format(top_right)
+#     cast_matrix_to_identity_format(top_right, inplace=True)
 
 #     mix_matr3 = np.zeros((half_size, half_size), dtype=np.int)
 #     for i in range(half_size):
@@ -205,14 +205,8 @@ def construct_mixing_matrix_pow_SPECK(pow: int, size: int):
     if pow < 1:
         raise Exception("Степень перемешивающей матрицы не должна быть меньше 1")
 
-    mixing_matrix_SPECK = construct_mixing_matrix_SPECK(size)
-    ret_mixing_matrix_SPECK = construct_mixing_matrix_SPECK(size)
-
-    for _ in range(pow - 1):
-        ret_mixing_matrix_SPECK = ret_mixing_matrix_SPECK @ mixing_matrix_SPECK
-        cast_matrix_to_identity_format(ret_mixing_matrix_SPECK)
-
-    return ret_mixing_matrix_SPECK
+    # степень зависит только от размера блока и показателя, поэтому берется из кэша
+    return matrix_cache.get_power('SPECK', size, pow, construct_mixing_matrix_SPECK)
 
 
 
@@ -250,7 +244,7 @@ def construct_mixing_matrix_pow_SPECK(pow: int, size: int):
 #         pos = (i + shift2) % half_size
 #         tmp_matr[i, pos] = 1
 #     tmp_matr = tmp_matr @ tmp_add_matr
-#     cast_matrix_to_identity_format(tmp_matr)
+#     cast_matrix_to_identity_format(tmp_matr, inplace=True)
 #     # mix_matr[0: half_size, 0: half_size] = tmp_matr
 #     mix_matr[0: half_size, half_size: size] = tmp_matr
     
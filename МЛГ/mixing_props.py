@@ -14,7 +14,7 @@ def pow_matrix_gen(matr: np.ndarray):
     """
     powed_matr = matr.copy()
     while True:
-        cast_matrix_to_identity_format(powed_matr)
+        cast_matrix_to_identity_format(powed_matr, inplace=True)
         yield powed_matr
         powed_matr = powed_matr @ matr
 
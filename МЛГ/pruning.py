@@ -0,0 +1,86 @@
+"""Правила отсечения при переборе наборов точек съема ММЛГ.
+
+Перемешивающая матрица ММЛГ из n ячеек состоит из блоков: блоки (i + 1, i) единичные, блоки (p, n - 1)
+для точек съема p - перемешивающая матрица модифицирующего преобразования. Поэтому каждому набору точек съема
+соответствует блочный орграф из n вершин с дугами i + 1 -> i и p -> n - 1, простые циклы которого имеют длины n - p.
+
+Любой цикл орграфа перемешивающей матрицы проецируется в замкнутый путь блочного орграфа той же длины, поэтому:
+    - если НОД длин n - p больше 1, то матрица непримитивна и ни экспонент, ни локальный экспонент не существуют;
+    - если степень перемешивающей матрицы полна (в столбцах ячейки cell), то полна и та же степень
+    блочной матрицы смежности (в столбце cell), поэтому экспонент блочной матрицы - нижняя граница экспонента.
+"""
+from math import gcd
+from typing import Callable, List, Optional
+
+import numpy as np
+
+
+class Pruning:
+    """
+    Набор правил отсечения для перебора наборов точек съема.
+
+    Атрибуты экземпляров:
+        known_value: Callable[[List[int]], Optional[int]]   значение, известное без вычисления, или None
+        lower_bound: Callable[[List[int]], int]             нижняя граница значения, отличного от -1
+    """
+
+    def __init__(
+        self,
+        known_value: Callable[[List[int]], Optional[int]] = None,
+        lower_bound: Callable[[List[int]], int] = None
+    ):
+        self.known_value = known_value or (lambda pickup_points: None)
+        self.lower_bound = lower_bound or (lambda pickup_points: 1)
+
+
+def cycle_lengths(n: int, pickup_points: List[int]) -> List[int]:
+    """Длины простых циклов блочного орграфа ММЛГ из n ячеек"""
+    return [n - point for point in pickup_points]
+
+
+def is_imprimitive(n: int, pickup_points: List[int]) -> bool:
+    """Проверка того, что НОД длин циклов блочного орграфа больше 1, то есть перемешивающая матрица непримитивна"""
+    period = 0
+    for length in cycle_lengths(n, pickup_points):
+        period = gcd(period, length)
+    return period != 1
+
+
+def construct_block_matrix(n: int, pickup_points: List[int]) -> np.ndarray:
+    """Строит матрицу смежности блочного орграфа ММЛГ из n ячеек"""
+    block_matr = np.zeros((n, n), dtype=bool)
+    for i in range(n - 1):
+        block_matr[i + 1, i] = True
+    for point in pickup_points:
+        block_matr[point, n - 1] = True
+    return block_matr
+
+
+def get_block_local_exponent(n: int, pickup_points: List[int], columns: slice) -> int:
+    """Возвращает наименьшую степень блочной матрицы, столбцы columns которой состоят из единиц, или -1,
+    если такой степени нет. По теореме Виландта для примитивной матрицы она не превосходит (n - 1)^2 + 1"""
+    block_matr = construct_block_matrix(n, pickup_points)
+    powed_matr = block_matr.copy()
+    for k in range(1, (n - 1) ** 2 + 2):
+        if powed_matr[:, columns].all():
+            return k
+        powed_matr = (powed_matr.astype(np.int64) @ block_matr) > 0
+    return -1
+
+
+def mmlr_exponent_pruning(n: int) -> Pruning:
+    """Правила отсечения для экспонента ММЛГ из n ячеек"""
+    return Pruning(
+        known_value=lambda pickup_points: -1 if is_imprimitive(n, pickup_points) else None,
+        lower_bound=lambda pickup_points: get_block_local_exponent(n, pickup_points, slice(None))
+    )
+
+
+def mmlr_local_exponent_pruning(n: int, cell: int) -> Pruning:
+    """Правила отсечения для локального экспонента ячейки cell ММЛГ из n ячеек.
+    Если период блочного орграфа больше 1, то длины путей в ячейку cell из ячеек разных классов импримитивности
+    различны по модулю периода, поэтому столбцы ячейки cell степеней матрицы никогда не становятся полными."""
+    return Pruning(
+        known_value=lambda pickup_points: -1 if is_imprimitive(n, pickup_points) else None,
+        lower_bound=lambda pickup_points: get_block_local_exponent(n, pickup_points, slice(cell, cell + 1))
+    )
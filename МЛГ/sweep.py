@@ -0,0 +1,166 @@
+"""Параллельный перебор наборов точек съема МЛГ.
+
+Все наборы точек съема для заданного диапазона их количества распределяются небольшими порциями
+между процессами пула: стоимость вычисления для разных наборов сильно отличается, поэтому порции
+выдаются освободившимся процессам динамически. Результаты для каждого количества точек съема
+записываются в файл, как только получены результаты для всех наборов с этим количеством точек.
+При указании журнала контрольных точек результат каждого набора сохраняется сразу после получения,
+а при возобновлении перебора уже вычисленные наборы пропускаются.
+
+Правила отсечения (модуль pruning) позволяют не вычислять значения, известные заранее, и, в режиме поиска
+лучших наборов, пропускать наборы, нижняя граница значения для которых больше наилучшего найденного значения.
+"""
+import math
+import operator
+from itertools import groupby
+from multiprocessing import Pool, cpu_count
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from checkpoint import Checkpoint
+from pruning import Pruning
+from utils import comb, progress_info
+
+
+# число порций, приходящихся на один процесс пула, при автоматическом выборе размера порции
+CHUNKS_PER_PROCESS = 8
+
+
+def pickup_points_sets(n: int, ppnum: int) -> Iterator[List[int]]:
+    """Перебирает наборы из ppnum + 1 точек съема регистра из n ячеек, 0 точка съема всегда присутсвует"""
+    for pp in comb(n - 1, ppnum):
+        yield [0] + pp
+
+
+def evaluate_task(task: Tuple[Callable, Dict[str, Any], int, int, List[int]]) -> Tuple[int, int, List[int], int]:
+    """Вычисляет значение исследуемого свойства для одного набора точек съема в процессе пула"""
+    func, params, ppnum, index, pickup_points = task
+    return ppnum, index, pickup_points, func(pickup_points, **params)
+
+
+def run_sweep(
+    func: Callable[..., int],
+    params: Dict[str, Any],
+    n: int,
+    ppnum_min: int,
+    ppnum_max: int,
+    write_results: Callable[[str, List[Tuple[int, List[int], int]]], None],
+    file_name: Callable[[int], str],
+    processes: int = None,
+    chunksize: int = None,
+    checkpoint: str = None,
+    resume: bool = False,
+    pruning: Pruning = None,
+    best_only: bool = False
+) -> None:
+    """
+    Перебирает наборы точек съема регистра из n ячеек, вычисляет для каждого набора func(pickup_points, **params)
+    и записывает результаты, отличные от -1, функцией write_results (write_exponents, write_perf_index)
+    в файл file_name(ppnum) отдельно для каждого количества точек съема ppnum.
+
+    func: функция, вычисляющая исследуемое свойство, должна быть определена на верхнем уровне модуля,
+    чтобы ее можно было передать в процессы пула
+
+    ppnum_min: минимальное перебираемое кол-во точек съема
+
+    ppnum_max: максимальное перебираемое число точек съема
+
+    processes: количество процессов пула, по умолчанию - количество ядер, при processes=1 перебор
+    выполняется в текущем процессе
+
+    chunksize: количество наборов точек съема, выдаваемых процессу за раз
+
+    checkpoint: путь к журналу контрольных точек, в который записывается результат каждого набора точек съема
+
+    resume: пропустить наборы точек съема, результаты для которых уже есть в журнале checkpoint
+
+    pruning: правила отсечения (pruning.mmlr_exponent_pruning, ...), по умолчанию значение вычисляется для всех наборов
+
+    best_only: для каждого количества точек съема записывать только наборы с наименьшим значением,
+    наборы, нижняя граница значения которых больше наименьшего найденного значения, не вычисляются
+    """
+
+    # ppnum_min - 1, ppnum_max - т.к. 0 точка съема всегда присутсвует
+    ppnums = range(ppnum_min - 1, ppnum_max)
+    expected = {ppnum: math.comb(n - 1, ppnum) for ppnum in ppnums}
+
+    log = Checkpoint(checkpoint, func.__name__, params, resume) if checkpoint else None
+    if pruning is None:
+        pruning = Pruning()
+
+    # results[ppnum]: [(index, pp, value)]
+    results = {ppnum: [] for ppnum in ppnums}
+    received = {ppnum: 0 for ppnum in ppnums}
+    best = {ppnum: None for ppnum in ppnums}
+
+    def collect(result: Tuple[int, int, List[int], int], logged: bool = False) -> None:
+        """Учитывает значение value, полученное для набора pickup_points с порядковым номером index;
+        value=None - значение не вычислялось, так как набор не может быть лучше найденных"""
+        ppnum, index, pickup_points, value = result
+        if log is not None and not logged and value is not None:
+            log.record(pickup_points, value)
+
+        received[ppnum] += 1
+        if value is not None and value != -1:
+            results[ppnum].append((index, pickup_points, value))
+            if best[ppnum] is None or value < best[ppnum]:
+                best[ppnum] = value
+
+        if received[ppnum] == expected[ppnum]:
+            ppnum_results = results.pop(ppnum)
+            if best_only:
+                ppnum_results = [item for item in ppnum_results if item[2] == best[ppnum]]
+
+            # сортировка по значению, при равенстве - в порядке перебора наборов точек съема
+            ppnum_results.sort(key=operator.itemgetter(2, 0))
+            write_results(
+                file_name(ppnum + 1),
+                [(ppnum + 1, pickup_points, value) for _, pickup_points, value in ppnum_results]
+            )
+            progress_info(f"ppnum={ppnum + 1} done", func.__name__)
+
+    # значения, известные заранее или восстановленные из журнала, учитываются до запуска вычислений,
+    # pending[ppnum]: [(нижняя граница, index, pp)] - наборы, для которых нужно вычисление
+    pending = {ppnum: [] for ppnum in ppnums}
+    for ppnum in ppnums:
+        for index, pickup_points in enumerate(pickup_points_sets(n, ppnum)):
+            value = pruning.known_value(pickup_points)
+            if value is None and log is not None:
+                value = log.get(pickup_points)
+            if value is not None:
+                collect((ppnum, index, pickup_points, value), logged=True)
+            else:
+                pending[ppnum].append((pruning.lower_bound(pickup_points) if best_only else 0, index, pickup_points))
+
+    if processes is None:
+        processes = cpu_count()
+    if chunksize is None:
+        chunksize = max(1, sum(map(len, pending.values())) // (processes * CHUNKS_PER_PROCESS))
+
+    def evaluate(tasks: List[Tuple[int, int, List[int]]], pool: Pool = None) -> None:
+        tasks = ((func, params, ppnum, index, pickup_points) for ppnum, index, pickup_points in tasks)
+        for result in (pool.imap_unordered(evaluate_task, tasks, chunksize) if pool else map(evaluate_task, tasks)):
+            collect(result)
+
+    def sweep(pool: Pool = None) -> None:
+        if not best_only:
+            evaluate([(ppnum, index, pp) for ppnum in ppnums for _, index, pp in pending[ppnum]], pool)
+            return
+
+        # наборы вычисляются группами в порядке возрастания нижней границы, пока она не превзойдет
+        # наименьшее найденное значение, оставшиеся наборы заведомо не лучше найденных
+        for ppnum in ppnums:
+            pending[ppnum].sort(key=operator.itemgetter(0))
+            for bound, group in groupby(pending[ppnum], key=operator.itemgetter(0)):
+                group = [(ppnum, index, pickup_points) for _, index, pickup_points in group]
+                if best[ppnum] is not None and bound > best[ppnum]:
+                    for task in group:
+                        collect(task + (None,))
+                else:
+                    evaluate(group, pool)
+
+    if processes == 1:
+        sweep()
+        return
+
+    with Pool(processes) as pool:
+        sweep(pool)
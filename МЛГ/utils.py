@@ -5,15 +5,23 @@ from inspect import stack
 
 
 
-def cast_matrix_to_identity_format(matr: np.ndarray):
+def cast_matrix_to_identity_format(matr: np.ndarray, inplace: bool = False) -> np.ndarray:
     """Заменяет все элементы матрицы большие нуля на 1
     Получаем 'единично-нормальную форму матрицы' (придуманный термин)
+    При inplace=True замена производится в самой матрице matr, иначе возвращается новая матрица
     """
-    size = matr.shape[0]
-    for i in range(size):
-        for j in range(size):
-            if matr[i, j] > 0:
-                matr[i, j] = 1
+    if not inplace:
+        matr = matr.copy()
+    np.minimum(matr, 1, out=matr)
+    return matr
+
+
+def change_column_order(matr: np.ndarray, inplace: bool = False) -> np.ndarray:
+    """Изменение порядка столбцов в матрице на обратный"""
+    if inplace:
+        matr[:] = matr[:, ::-1]
+        return matr
+    return matr[:, ::-1].copy()
 
 def comb(n, k):
     """Генерация сочетаний из `n` по `k` без повторений из диапазона [1, n]"""
@@ -73,8 +81,11 @@ def write_perf_index(file_name: str, results: List[Tuple[int, List[int], int]])
         file.write("<Pickup points> --- <Index of perfection>\n")
         file.write('\n'.join(f"{r[1]} --- {r[2]}" for r in results))
 
-def progress_info(message: str) -> None:
-    print(f"{stack()[1][3]}: {message}")
+def progress_info(message: str, caller: str = None) -> None:
+    """Вывод сообщения о ходе вычислений с именем вызывающей функции (либо caller)"""
+    if caller is None:
+        caller = stack()[1][3]
+    print(f"{caller}: {message}")
 
 
 